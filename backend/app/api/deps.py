@@ -2,43 +2,165 @@
 API Dependencies - Authentication, Database, etc.
 """
 
+import hashlib
 import logging
-from typing import Optional
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional, Sequence, Tuple
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy import select
+from cachetools import TTLCache
+
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.core.security import verify_token
+from app.core.config import settings
 from app.core.exceptions import AuthenticationError, AuthorizationError
 from app.services.database import get_db
 from app.services.sliver_client import sliver_manager, SliverManager
-from app.models import User
+from app.models import User, Role, Permission, RolePermission
 
 logger = logging.getLogger(__name__)
 
-# HTTP Bearer token scheme
-security = HTTPBearer(auto_error=False)
+# role id -> (permission set, has wildcard, sorted permission strings);
+# shared by every user of a role
+_role_permissions: Dict[int, Tuple[FrozenSet[str], bool, Tuple[str, ...]]] = {}
+
+
+def _intern_role_permissions(
+    role_id: int, permissions: FrozenSet[str], has_wildcard: bool
+) -> Tuple[FrozenSet[str], bool, Tuple[str, ...]]:
+    """Reuse the stored permission set for a role while it is unchanged"""
+    current = _role_permissions.get(role_id)
+    if current is None or current[0] != permissions or current[1] != has_wildcard:
+        current = _role_permissions[role_id] = (
+            permissions,
+            has_wildcard,
+            tuple(sorted(permissions)),
+        )
+    return current
+
+
+@lru_cache(maxsize=1024)
+def _permission_allowed(
+    permissions: FrozenSet[str], has_wildcard: bool, resource: str, action: str
+) -> bool:
+    """Memoized permission decision, keyed by the role's interned permission set"""
+    return has_wildcard or f"{resource}.{action}" in permissions
+
+
+@dataclass(frozen=True)
+class AuthContext:
+    """
+    Lightweight snapshot of the authenticated user
+
+    Carries only the attributes request handlers read, so it can be cached
+    across requests without holding on to ORM instances.
+    """
+
+    id: int
+    username: str
+    email: Optional[str]
+    is_active: bool
+    role_id: Optional[int]
+    role_name: Optional[str]
+    permissions: FrozenSet[str]
+    has_wildcard: bool = False
+    permission_strings: Tuple[str, ...] = ()
+
+    @property
+    def is_admin(self) -> bool:
+        """Check if user is admin"""
+        return self.role_name == "admin"
+
+    def has_permission(self, resource: str, action: str) -> bool:
+        """Check if user has a specific permission"""
+        if self.role_id is None:
+            return False
+        return _permission_allowed(self.permissions, self.has_wildcard, resource, action)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Row]) -> "AuthContext":
+        """Build from (id, username, email, is_active, role id, role, resource, action) rows"""
+        user_id, username, email, is_active, role_id, role_name = rows[0][:6]
+        perms = [(row.resource, row.action) for row in rows if row.resource is not None]
+        permissions = frozenset(f"{resource}.{action}" for resource, action in perms)
+        has_wildcard = any(resource == "*" or action == "*" for resource, action in perms)
+        permission_strings = tuple(sorted(permissions))
+        if role_id is not None:
+            permissions, has_wildcard, permission_strings = _intern_role_permissions(
+                role_id, permissions, has_wildcard
+            )
+        return cls(
+            id=user_id,
+            username=username,
+            email=email,
+            is_active=is_active,
+            role_id=role_id,
+            role_name=role_name,
+            permissions=permissions,
+            has_wildcard=has_wildcard,
+            permission_strings=permission_strings,
+        )
+
+
+# token digest -> (AuthContext, token exp, user epoch)
+_auth_cache: TTLCache = TTLCache(
+    maxsize=settings.auth_cache_size,
+    ttl=settings.auth_cache_ttl_seconds,
+)
+# Bumped to drop every cached context of a user (logout, user update/delete)
+_user_epochs: Dict[int, int] = {}
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def invalidate_auth_cache(user_id: int) -> None:
+    """Invalidate cached auth contexts for a user"""
+    _user_epochs[user_id] = _user_epochs.get(user_id, 0) + 1
+
+
+def get_cached_auth(token: str) -> Optional[AuthContext]:
+    """Return the cached auth context for a token, if still valid"""
+    entry = _auth_cache.get(_token_digest(token))
+    if entry is None:
+        return None
+
+    context, expires_at, epoch = entry
+    if expires_at <= time.time() or _user_epochs.get(context.id, 0) != epoch:
+        _auth_cache.pop(_token_digest(token), None)
+        return None
+    return context
 
 
 async def get_current_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    request: Request,
     db: AsyncSession = Depends(get_db),
-) -> User:
+) -> AuthContext:
     """
     Get current authenticated user from JWT token
+
+    The token is parsed and verified by JWTAuthMiddleware; verified tokens
+    are cached for a short TTL, so repeat requests skip both JWT
+    verification and the user/role/permission query.
     """
-    if not credentials:
+    state = request.scope.get("state", {})
+    cached = state.get("auth")
+    if cached is not None:
+        return cached
+
+    token = state.get("token")
+    if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    token = credentials.credentials
-    payload = verify_token(token, token_type="access")
+    payload = state.get("token_payload")
 
     if not payload:
         raise HTTPException(
@@ -54,35 +176,50 @@ async def get_current_user(
             detail="Invalid token payload",
         )
 
-    # Get user from database with role and permissions eager-loaded
-    from app.models import Role, Permission
+    # Project only the columns the auth context needs, one row per permission
     result = await db.execute(
-        select(User)
-        .options(
-            selectinload(User.role).selectinload(Role.permissions)
+        select(
+            User.id,
+            User.username,
+            User.email,
+            User.is_active,
+            Role.id,
+            Role.name,
+            Permission.resource,
+            Permission.action,
         )
+        .outerjoin(Role, User.role_id == Role.id)
+        .outerjoin(RolePermission, RolePermission.c.role_id == Role.id)
+        .outerjoin(Permission, RolePermission.c.permission_id == Permission.id)
         .where(User.id == int(user_id))
     )
-    user = result.scalar_one_or_none()
+    rows = result.all()
 
-    if not user:
+    if not rows:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
 
-    if not user.is_active:
+    context = AuthContext.from_rows(rows)
+
+    if not context.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is disabled",
         )
 
-    return user
+    _auth_cache[_token_digest(token)] = (
+        context,
+        payload.get("exp", 0),
+        _user_epochs.get(context.id, 0),
+    )
+    return context
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: AuthContext = Depends(get_current_user),
+) -> AuthContext:
     """Get current active user"""
     if not current_user.is_active:
         raise HTTPException(
@@ -93,8 +230,8 @@ async def get_current_active_user(
 
 
 async def get_admin_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: AuthContext = Depends(get_current_user),
+) -> AuthContext:
     """Require admin user"""
     if not current_user.is_admin:
         raise HTTPException(
@@ -104,10 +241,14 @@ async def get_admin_user(
     return current_user
 
 
+@lru_cache(maxsize=None)
 def require_permission(resource: str, action: str):
     """
     Dependency factory to check user permissions
 
+    Memoized, so every use of the same check shares one dependency callable
+    and FastAPI resolves it at most once per request.
+
     Usage:
         @router.get("/sessions")
         async def list_sessions(
@@ -116,8 +257,8 @@ def require_permission(resource: str, action: str):
             ...
     """
     async def permission_checker(
-        current_user: User = Depends(get_current_user),
-    ) -> User:
+        current_user: AuthContext = Depends(get_current_user),
+    ) -> AuthContext:
         if not current_user.has_permission(resource, action):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -128,9 +269,10 @@ def require_permission(resource: str, action: str):
     return permission_checker
 
 
+@lru_cache(maxsize=None)
 def require_role(*roles: str):
     """
-    Dependency factory to check user role
+    Dependency factory to check user role (memoized like require_permission)
 
     Usage:
         @router.get("/admin")
@@ -140,9 +282,9 @@ def require_role(*roles: str):
             ...
     """
     async def role_checker(
-        current_user: User = Depends(get_current_user),
-    ) -> User:
-        if current_user.role.name not in roles:
+        current_user: AuthContext = Depends(get_current_user),
+    ) -> AuthContext:
+        if current_user.role_name not in roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Role required: {', '.join(roles)}",
@@ -152,8 +294,13 @@ def require_role(*roles: str):
     return role_checker
 
 
+async def get_client_ip(request: Request) -> Optional[str]:
+    """Client address for audit records, None if the transport has none"""
+    return request.client.host if request.client else None
+
+
 async def get_sliver(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthContext = Depends(get_current_user),
 ) -> SliverManager:
     """
     Get Sliver client - requires authentication
@@ -164,3 +311,49 @@ async def get_sliver(
             detail="Sliver server not connected",
         )
     return sliver_manager
+
+
+async def get_session_or_404(
+    session_id: str,
+    sliver: SliverManager = Depends(get_sliver),
+) -> dict:
+    """
+    Resolve a session from the path, raising 404 if it doesn't exist
+
+    Usage:
+        @router.get("/{session_id}/processes")
+        async def list_processes(
+            session: dict = Depends(get_session_or_404)
+        ):
+            ...
+    """
+    session = await sliver.get_session(session_id)
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Session {session_id} not found",
+        )
+    return session
+
+
+async def get_beacon_or_404(
+    beacon_id: str,
+    sliver: SliverManager = Depends(get_sliver),
+) -> dict:
+    """
+    Resolve a beacon from the path, raising 404 if it doesn't exist
+
+    Usage:
+        @router.post("/{beacon_id}/tasks/ps")
+        async def queue_ps_task(
+            beacon: dict = Depends(get_beacon_or_404)
+        ):
+            ...
+    """
+    beacon = await sliver.get_beacon(beacon_id)
+    if not beacon:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Beacon {beacon_id} not found",
+        )
+    return beacon
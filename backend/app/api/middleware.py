@@ -0,0 +1,118 @@
+"""
+API Middleware - Authentication, profiling
+"""
+
+from urllib.parse import parse_qs
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.security import verify_token
+from app.api.deps import get_cached_auth
+
+# pyinstrument is a development dependency; profiling is opt-in
+try:
+    from pyinstrument import Profiler
+    PYINSTRUMENT_AVAILABLE = True
+except ImportError:
+    PYINSTRUMENT_AVAILABLE = False
+
+_BEARER_PREFIX = b"bearer "
+
+
+class JWTAuthMiddleware:
+    """
+    Pure ASGI middleware that resolves the bearer token once per request
+
+    Parses the Authorization header straight off the ASGI scope and stores
+    the result in scope["state"]:
+        - "auth":          cached AuthContext for the token (if any)
+        - "token":         the raw bearer token
+        - "token_payload": verified JWT claims, or None if invalid
+
+    Requests are never rejected here; get_current_user decides.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                if value[:7].lower() == _BEARER_PREFIX:
+                    self._authenticate(scope, value[7:].decode("latin-1").strip())
+                break
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def _authenticate(scope: Scope, token: str) -> None:
+        if not token:
+            return
+
+        state = scope.setdefault("state", {})
+        state["token"] = token
+
+        cached = get_cached_auth(token)
+        if cached is not None:
+            state["auth"] = cached
+            return
+
+        state["token_payload"] = verify_token(token, token_type="access")
+
+
+class ProfilerMiddleware:
+    """
+    Pure ASGI middleware that profiles a single request on demand
+
+    Active for HTTP requests carrying ?profile=1 from an admin user whose
+    auth context is already cached; the normal response is discarded and
+    replaced with pyinstrument's HTML report. Must sit inside
+    JWTAuthMiddleware, which resolves the user.
+    Only registered when settings.profiling is enabled.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        async def discard(message: Message) -> None:
+            pass
+
+        profiler = Profiler(async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.stop()
+
+        body = profiler.output_html().encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/html; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    def _should_profile(scope: Scope) -> bool:
+        if b"profile=" not in scope["query_string"]:
+            return False
+        if parse_qs(scope["query_string"].decode("latin-1")).get("profile") != ["1"]:
+            return False
+
+        # Only trust the cached AuthContext: the token's role claim is fixed
+        # at login and misses later demotion or deactivation. On a cache miss
+        # the request just runs unprofiled.
+        auth = scope.get("state", {}).get("auth")
+        return auth is not None and auth.is_admin
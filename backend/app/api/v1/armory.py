@@ -2,15 +2,16 @@
 Armory API endpoints - Extension management
 """
 
-import os
 from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from pydantic import BaseModel
+from cachetools import TTLCache
 
 from app.api.deps import get_current_user, require_role
 from app.services.sliver_client import get_sliver_client, SliverManager
 from app.core.exceptions import SliverCommandError
-from app.core.config import settings
+from app.core.config import github_token_holder
+from app.core.responses import ORJSONResponse
 
 router = APIRouter()
 
@@ -53,6 +54,27 @@ class GitHubTokenStatus(BaseModel):
     token_preview: Optional[str] = None  # Shows first/last 4 chars only
 
 
+# Armory listing as (package, lowercased name, lowercased command name), with
+# packages already validated into the ArmoryPackage shape. Refreshing installed
+# status shells out to sliver-client, so keep it briefly.
+_armory_cache: TTLCache = TTLCache(maxsize=1, ttl=60)
+
+
+async def _get_indexed_armory(sliver: SliverManager) -> List[Tuple[dict, str, str]]:
+    indexed = _armory_cache.get("packages")
+    if indexed is None:
+        packages = await sliver.get_armory()
+        indexed = []
+        for p in packages:
+            package = ArmoryPackage.model_validate(p).model_dump()
+            indexed.append(
+                (package, package["name"].lower(), package["command_name"].lower())
+            )
+        if indexed:
+            _armory_cache["packages"] = indexed
+    return indexed
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # Endpoints
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -65,27 +87,25 @@ async def list_armory_packages(
     sliver: SliverManager = Depends(get_sliver_client),
 ):
     """Get list of available armory packages"""
-    packages = await sliver.get_armory()
-
-    # Filter by installed if requested
-    if installed_only:
-        packages = [p for p in packages if p["installed"]]
-
-    # Search filter
-    if search:
-        search_lower = search.lower()
-        packages = [
-            p for p in packages
-            if search_lower in p["name"].lower() or search_lower in p.get("command_name", "").lower()
-        ]
-
-    installed_count = sum(1 for p in packages if p["installed"])
-
-    return ArmoryListResponse(
-        packages=[ArmoryPackage(**p) for p in packages],
-        total=len(packages),
-        installed_count=installed_count,
-    )
+    search_lower = search.lower() if search else None
+
+    # Single pass: filter and count installed packages
+    packages = []
+    installed_count = 0
+    for p, name_lower, command_lower in await _get_indexed_armory(sliver):
+        if installed_only and not p["installed"]:
+            continue
+        if search_lower and search_lower not in name_lower and search_lower not in command_lower:
+            continue
+        packages.append(p)
+        installed_count += p["installed"]
+
+    # Cached packages are already in ArmoryPackage shape; serialize directly
+    return ORJSONResponse({
+        "packages": packages,
+        "total": len(packages),
+        "installed_count": installed_count,
+    })
 
 
 @router.post("/install", response_model=ArmoryActionResponse)
@@ -97,6 +117,7 @@ async def install_package(
     """Install an armory package"""
     try:
         result = await sliver.install_armory_package(request.package_name)
+        _armory_cache.clear()
         return ArmoryActionResponse(**result)
     except SliverCommandError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -111,6 +132,7 @@ async def uninstall_package(
     """Uninstall an armory package"""
     try:
         result = await sliver.uninstall_armory_package(request.package_name)
+        _armory_cache.clear()
         return ArmoryActionResponse(**result)
     except SliverCommandError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -121,7 +143,7 @@ async def get_github_token_status(
     current_user=Depends(require_role("admin")),
 ):
     """Check if GitHub token is configured"""
-    token = settings.github_token
+    token = github_token_holder.get()
     if token:
         # Show preview: ghp_xxxx...xxxx
         if len(token) > 8:
@@ -149,12 +171,8 @@ async def set_github_token(
             detail="Token cannot be empty"
         )
 
-    # Set in settings (runtime only - not persisted)
-    # We need to modify the settings object directly since it's cached
-    object.__setattr__(settings, 'github_token', token)
-
-    # Also set in environment for subprocess calls
-    os.environ['GITHUB_TOKEN'] = token
+    # Runtime only - not persisted; passed to sliver-client subprocesses
+    github_token_holder.set(token)
 
     if len(token) > 8:
         preview = f"{token[:8]}...{token[-4:]}"
@@ -169,7 +187,5 @@ async def remove_github_token(
     current_user=Depends(require_role("admin")),
 ):
     """Remove GitHub token"""
-    object.__setattr__(settings, 'github_token', None)
-    if 'GITHUB_TOKEN' in os.environ:
-        del os.environ['GITHUB_TOKEN']
+    github_token_holder.set(None)
     return {"success": True, "message": "GitHub token removed"}
@@ -2,13 +2,14 @@
 Authentication endpoints
 """
 
+import asyncio
 import logging
 from datetime import datetime, timezone
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.core.security import (
     verify_password,
@@ -17,16 +18,21 @@ from app.core.security import (
     verify_token,
 )
 from app.core.config import settings
+from app.core.rate_limit import RateLimiter
 from app.services.database import get_db
-from app.models import User, AuditLog
+from app.models import User, Role
+from app.services.batch_writer import audit_logger
 from app.schemas.auth import LoginRequest, RefreshRequest, Token
 from app.schemas.user import CurrentUser
-from app.api.deps import get_current_user
+from app.api.deps import AuthContext, get_client_ip, get_current_user, invalidate_auth_cache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Bounds bcrypt work per (username, client IP) before it reaches the hash
+login_limiter = RateLimiter(limit=settings.login_rate_limit_per_minute, window=60)
+
 
 @router.post("/login", response_model=Token)
 async def login(
@@ -37,19 +43,36 @@ async def login(
     """
     Authenticate user and return JWT tokens
     """
-    # Find user
+    client_ip = request.client.host if request.client else None
+    login_limiter.hit((login_data.username, client_ip))
+
+    # Find user (only the columns login needs)
     result = await db.execute(
-        select(User)
-        .options(selectinload(User.role))
+        select(
+            User.id,
+            User.username,
+            User.password_hash,
+            User.is_active,
+            User.locked_until,
+            Role.name.label("role_name"),
+        )
+        .join(Role, User.role_id == Role.id)
         .where(User.username == login_data.username)
     )
-    user = result.scalar_one_or_none()
+    user = result.one_or_none()
 
     # Check credentials
-    if not user or not verify_password(login_data.password, user.password_hash):
+    # bcrypt is deliberately slow; keep it off the event loop
+    if not user or not await asyncio.to_thread(
+        verify_password, login_data.password, user.password_hash
+    ):
         # Log failed attempt
         if user:
-            user.failed_login_attempts += 1
+            await db.execute(
+                update(User)
+                .where(User.id == user.id)
+                .values(failed_login_attempts=User.failed_login_attempts + 1)
+            )
             await db.commit()
 
         raise HTTPException(
@@ -72,28 +95,30 @@ async def login(
         )
 
     # Reset failed attempts
-    user.failed_login_attempts = 0
-    user.last_login = datetime.now(timezone.utc)
+    await db.execute(
+        update(User)
+        .where(User.id == user.id)
+        .values(failed_login_attempts=0, last_login=datetime.now(timezone.utc))
+    )
 
     # Create tokens
     access_token = create_access_token(
         subject=str(user.id),
-        additional_claims={"role": user.role.name},
+        additional_claims={"role": user.role_name},
     )
     refresh_token = create_refresh_token(subject=str(user.id))
 
     # Log successful login
-    audit_log = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="login",
         resource="auth",
-        ip_address=request.client.host if request.client else None,
+        ip_address=client_ip,
         user_agent=request.headers.get("user-agent"),
     )
-    db.add(audit_log)
     await db.commit()
 
-    logger.info(f"User {user.username} logged in from {request.client.host if request.client else 'unknown'}")
+    logger.info(f"User {user.username} logged in from {client_ip or 'unknown'}")
 
     return Token(
         access_token=access_token,
@@ -123,13 +148,13 @@ async def refresh_token(
 
     # Verify user still exists and is active
     result = await db.execute(
-        select(User)
-        .options(selectinload(User.role))
+        select(User.id, User.is_active, Role.name)
+        .join(Role, User.role_id == Role.id)
         .where(User.id == int(user_id))
     )
-    user = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not user or not user.is_active:
+    if not row or not row.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
@@ -137,10 +162,10 @@ async def refresh_token(
 
     # Create new tokens
     access_token = create_access_token(
-        subject=str(user.id),
-        additional_claims={"role": user.role.name},
+        subject=str(row.id),
+        additional_claims={"role": row.name},
     )
-    new_refresh_token = create_refresh_token(subject=str(user.id))
+    new_refresh_token = create_refresh_token(subject=str(row.id))
 
     return Token(
         access_token=access_token,
@@ -152,43 +177,36 @@ async def refresh_token(
 
 @router.post("/logout")
 async def logout(
-    request: Request,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    ip_address: Optional[str] = Depends(get_client_ip),
+    current_user: AuthContext = Depends(get_current_user),
 ):
     """
     Logout user (invalidate token - client should discard)
     """
+    invalidate_auth_cache(current_user.id)
+
     # Log logout
-    audit_log = AuditLog(
+    audit_logger.log(
         user_id=current_user.id,
         action="logout",
         resource="auth",
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit_log)
-    await db.commit()
 
     return {"message": "Successfully logged out"}
 
 
 @router.get("/me", response_model=CurrentUser)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthContext = Depends(get_current_user),
 ):
     """
     Get current user information
     """
-    permissions = []
-    if current_user.role:
-        permissions = [
-            f"{p.resource}.{p.action}" for p in current_user.role.permissions
-        ]
-
     return CurrentUser(
         id=current_user.id,
         username=current_user.username,
         email=current_user.email,
-        role=current_user.role.name if current_user.role else "unknown",
-        permissions=permissions,
+        role=current_user.role_name or "unknown",
+        permissions=list(current_user.permission_strings),
     )
@@ -3,21 +3,48 @@ Beacon management endpoints
 """
 
 import logging
+from datetime import datetime, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, status
 
-from app.api.deps import get_sliver, require_permission, get_db
+from app.api.deps import get_client_ip, get_sliver, require_permission, get_beacon_or_404
 from app.services.sliver_client import SliverManager
-from app.models import User, AuditLog
-from app.schemas.beacon import BeaconResponse, BeaconList
+from app.services.batch_writer import audit_logger
+from app.models import User
+from app.core.responses import ORJSONResponse
+from app.schemas.beacon import (
+    BeaconResponse,
+    BeaconList,
+    ShellTaskRequest,
+    DownloadTaskRequest,
+)
 from app.schemas.common import MessageResponse
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+_BEACON_FIELDS = {
+    name: None if field.is_required() else field.default
+    for name, field in BeaconResponse.model_fields.items()
+}
+
+
+def _beacon_payload(beacon: dict) -> dict:
+    """
+    Shape a trusted beacon dict like BeaconResponse without validating it
+
+    Sliver reports check-in times as unix timestamps; convert those to UTC
+    datetimes as BeaconResponse validation would.
+    """
+    payload = {name: beacon.get(name, default) for name, default in _BEACON_FIELDS.items()}
+    for key in ("last_checkin", "next_checkin"):
+        value = payload[key]
+        if isinstance(value, (int, float)):
+            payload[key] = datetime.fromtimestamp(value, tz=timezone.utc)
+    return payload
+
 
 @router.get("", response_model=BeaconList)
 async def list_beacons(
@@ -28,60 +55,49 @@ async def list_beacons(
     List all beacons
     """
     beacons = await sliver.get_beacons()
-    return BeaconList(
-        beacons=[BeaconResponse(**b) for b in beacons],
-        total=len(beacons),
-    )
+    # Server-side data; skip per-field response validation
+    return ORJSONResponse({
+        "beacons": [_beacon_payload(b) for b in beacons],
+        "total": len(beacons),
+    })
 
 
 @router.get("/{beacon_id}", response_model=BeaconResponse)
 async def get_beacon(
     beacon_id: str,
-    sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("beacons", "read")),
+    beacon: dict = Depends(get_beacon_or_404),
 ):
     """
     Get beacon details
     """
-    beacon = await sliver.get_beacon(beacon_id)
-    if not beacon:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Beacon {beacon_id} not found",
-        )
     return BeaconResponse(**beacon)
 
 
 @router.delete("/{beacon_id}", response_model=MessageResponse)
 async def kill_beacon(
     beacon_id: str,
-    request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
+    beacon: dict = Depends(get_beacon_or_404),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("beacons", "delete")),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     Kill a beacon
     """
-    beacon = await sliver.get_beacon(beacon_id)
-    if not beacon:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Beacon {beacon_id} not found",
-        )
-
+    # The lookup (usually served from the cache) must finish before the kill:
+    # removing the beacon drops it from the listing the lookup reads
     await sliver.kill_beacon(beacon_id)
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="kill",
         resource="beacons",
         resource_id=beacon_id,
         details={"hostname": beacon.get("hostname")},
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return MessageResponse(message=f"Beacon {beacon_id} killed")
 
@@ -90,195 +106,135 @@ async def kill_beacon(
 # Beacon Task Operations
 # ═══════════════════════════════════════════════════════════════════════════
 
-@router.get("/{beacon_id}/tasks")
+@router.get("/{beacon_id}/tasks", response_class=ORJSONResponse)
 async def list_beacon_tasks(
     beacon_id: str,
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("beacons", "read")),
+    beacon: dict = Depends(get_beacon_or_404),
 ):
     """
     List tasks for a beacon
     """
-    beacon = await sliver.get_beacon(beacon_id)
-    if not beacon:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Beacon {beacon_id} not found",
-        )
-
     tasks = await sliver.get_beacon_tasks(beacon_id)
     return {"tasks": tasks, "total": len(tasks)}
 
 
-@router.post("/{beacon_id}/tasks/shell")
+@router.post("/{beacon_id}/tasks/shell", response_class=ORJSONResponse)
 async def queue_shell_task(
     beacon_id: str,
-    request: Request,
+    task_data: ShellTaskRequest,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("beacons", "execute")),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     Queue a shell command on beacon
     """
-    beacon = await sliver.get_beacon(beacon_id)
-    if not beacon:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Beacon {beacon_id} not found",
-        )
-
-    body = await request.json()
-    command = body.get("command")
-    if not command:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Command is required",
-        )
-
+    command = task_data.command
     result = await sliver.beacon_shell(beacon_id, command)
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="beacon_shell",
         resource="beacons",
         resource_id=beacon_id,
         details={"command": command[:500], "task_id": result.get("task_id")},
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return result
 
 
-@router.post("/{beacon_id}/tasks/ps")
+@router.post("/{beacon_id}/tasks/ps", response_class=ORJSONResponse)
 async def queue_ps_task(
     beacon_id: str,
-    request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("beacons", "read")),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     Queue process list task on beacon
     """
-    beacon = await sliver.get_beacon(beacon_id)
-    if not beacon:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Beacon {beacon_id} not found",
-        )
-
     result = await sliver.beacon_ps(beacon_id)
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="beacon_ps",
         resource="beacons",
         resource_id=beacon_id,
         details={"task_id": result.get("task_id")},
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return result
 
 
-@router.post("/{beacon_id}/tasks/screenshot")
+@router.post("/{beacon_id}/tasks/screenshot", response_class=ORJSONResponse)
 async def queue_screenshot_task(
     beacon_id: str,
-    request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("beacons", "read")),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     Queue screenshot task on beacon
     """
-    beacon = await sliver.get_beacon(beacon_id)
-    if not beacon:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Beacon {beacon_id} not found",
-        )
-
     result = await sliver.beacon_screenshot(beacon_id)
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="beacon_screenshot",
         resource="beacons",
         resource_id=beacon_id,
         details={"task_id": result.get("task_id")},
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return result
 
 
-@router.post("/{beacon_id}/tasks/download")
+@router.post("/{beacon_id}/tasks/download", response_class=ORJSONResponse)
 async def queue_download_task(
     beacon_id: str,
-    request: Request,
+    task_data: DownloadTaskRequest,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("files", "read")),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     Queue file download task on beacon
     """
-    beacon = await sliver.get_beacon(beacon_id)
-    if not beacon:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Beacon {beacon_id} not found",
-        )
-
-    body = await request.json()
-    remote_path = body.get("remote_path")
-    if not remote_path:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="remote_path is required",
-        )
-
+    remote_path = task_data.remote_path
     result = await sliver.beacon_download(beacon_id, remote_path)
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="beacon_download",
         resource="beacons",
         resource_id=beacon_id,
         details={"path": remote_path, "task_id": result.get("task_id")},
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return result
 
 
-@router.get("/{beacon_id}/tasks/{task_id}")
+@router.get("/{beacon_id}/tasks/{task_id}", response_class=ORJSONResponse)
 async def get_task_result(
     beacon_id: str,
     task_id: str,
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("beacons", "read")),
+    beacon: dict = Depends(get_beacon_or_404),
 ):
     """
     Get result of a specific beacon task
     """
-    beacon = await sliver.get_beacon(beacon_id)
-    if not beacon:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Beacon {beacon_id} not found",
-        )
-
     result = await sliver.get_task_result(beacon_id, task_id)
     if not result:
         raise HTTPException(
@@ -311,21 +267,13 @@ class ExecuteAssemblyTaskResponse(BaseModel):
 async def queue_execute_assembly_task(
     beacon_id: str,
     request_data: ExecuteAssemblyRequest,
-    request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("beacons", "execute")),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     Queue execute-assembly task on beacon
     """
-    beacon = await sliver.get_beacon(beacon_id)
-    if not beacon:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Beacon {beacon_id} not found",
-        )
-
     result = await sliver.beacon_execute_assembly(
         beacon_id,
         request_data.assembly_path,
@@ -333,7 +281,7 @@ async def queue_execute_assembly_task(
     )
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="beacon_execute_assembly",
         resource="beacons",
@@ -343,9 +291,8 @@ async def queue_execute_assembly_task(
             "arguments": request_data.arguments[:200],
             "task_id": result.get("task_id"),
         },
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return ExecuteAssemblyTaskResponse(
         task_id=result.get("task_id", ""),
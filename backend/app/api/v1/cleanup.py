@@ -2,16 +2,26 @@
 Cleanup API endpoints - Session/Beacon cleanup management
 """
 
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List, Optional
 from pydantic import BaseModel
 
 from app.api.deps import get_current_user, require_role
-from app.services.sliver_client import get_sliver_client, SliverManager
+from app.services.sliver_client import get_sliver_client, SliverManager, sliver_manager
+from app.services.adaptive_batcher import AdaptiveBatcher
 from app.core.exceptions import SliverCommandError
+from app.core.responses import ORJSONResponse
 
 router = APIRouter()
 
+# Bulk kills arriving within a short window (25 ms) are merged, so an ID
+# named by several operators is killed once; the merged batch then kills
+# its IDs concurrently under the Sliver RPC limit
+_session_kill_batcher = AdaptiveBatcher(sliver_manager.bulk_kill_sessions)
+_beacon_kill_batcher = AdaptiveBatcher(sliver_manager.bulk_kill_beacons)
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # Schemas
@@ -23,7 +33,7 @@ class StaleSession(BaseModel):
     hostname: str
     username: str
     os: str
-    stale_minutes: int
+    stale_minutes: int = 0
 
 
 class DeadBeacon(BaseModel):
@@ -32,7 +42,7 @@ class DeadBeacon(BaseModel):
     hostname: str
     username: str
     os: str
-    missed_checkins: int
+    missed_checkins: int = 0
 
 
 class CleanupStatusResponse(BaseModel):
@@ -71,38 +81,19 @@ async def get_cleanup_status(
     sliver: SliverManager = Depends(get_sliver_client),
 ):
     """Get cleanup status - stale sessions, dead beacons"""
-    # Get all data
-    sessions = await sliver.get_sessions()
-    beacons = await sliver.get_beacons()
-    jobs = await sliver.get_jobs()
-
-    # Get stale/dead
-    stale_sessions = await sliver.get_stale_sessions(stale_threshold_minutes)
-    dead_beacons = await sliver.get_dead_beacons(missed_checkins_threshold)
+    # Get all data and stale/dead entries concurrently
+    sessions, beacons, jobs, stale_sessions, dead_beacons = await asyncio.gather(
+        sliver.get_sessions(),
+        sliver.get_beacons(),
+        sliver.get_jobs(),
+        sliver.get_stale_sessions(stale_threshold_minutes),
+        sliver.get_dead_beacons(missed_checkins_threshold),
+    )
 
     return CleanupStatusResponse(
-        stale_sessions=[
-            StaleSession(
-                id=s["id"],
-                name=s["name"],
-                hostname=s["hostname"],
-                username=s["username"],
-                os=s["os"],
-                stale_minutes=s.get("stale_minutes", 0),
-            )
-            for s in stale_sessions
-        ],
-        dead_beacons=[
-            DeadBeacon(
-                id=b["id"],
-                name=b["name"],
-                hostname=b["hostname"],
-                username=b["username"],
-                os=b["os"],
-                missed_checkins=b.get("missed_checkins", 0),
-            )
-            for b in dead_beacons
-        ],
+        # Extra keys on the Sliver dicts are ignored by validation
+        stale_sessions=[StaleSession.model_validate(s) for s in stale_sessions],
+        dead_beacons=[DeadBeacon.model_validate(b) for b in dead_beacons],
         total_sessions=len(sessions),
         total_beacons=len(beacons),
         total_jobs=len(jobs),
@@ -117,7 +108,7 @@ async def bulk_kill_sessions(
 ):
     """Kill multiple sessions at once"""
     try:
-        result = await sliver.bulk_kill_sessions(request.ids)
+        result = await _session_kill_batcher.submit(request.ids)
         return BulkKillResponse(**result)
     except SliverCommandError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -131,7 +122,7 @@ async def bulk_kill_beacons(
 ):
     """Kill multiple beacons at once"""
     try:
-        result = await sliver.bulk_kill_beacons(request.ids)
+        result = await _beacon_kill_batcher.submit(request.ids)
         return BulkKillResponse(**result)
     except SliverCommandError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -176,18 +167,21 @@ async def kill_all_jobs(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.post("/kill-everything")
+@router.post("/kill-everything", response_model=KillAllResponse)
 async def kill_everything(
     current_user=Depends(require_role("admin")),
     sliver: SliverManager = Depends(get_sliver_client),
 ):
     """Kill all sessions, beacons, and jobs (admin only) - DANGEROUS"""
     try:
-        sessions_result = await sliver.kill_all_sessions()
-        beacons_result = await sliver.kill_all_beacons()
-        jobs_result = await sliver.kill_all_jobs()
-
-        return {
+        # Independent RPCs - run them concurrently
+        sessions_result, beacons_result, jobs_result = await asyncio.gather(
+            sliver.kill_all_sessions(),
+            sliver.kill_all_beacons(),
+            sliver.kill_all_jobs(),
+        )
+
+        return ORJSONResponse({
             "sessions_killed": len(sessions_result["success"]),
             "beacons_killed": len(beacons_result["success"]),
             "jobs_killed": len(jobs_result["success"]),
@@ -196,6 +190,6 @@ async def kill_everything(
                 beacons_result["failed"] +
                 jobs_result["failed"]
             ),
-        }
+        })
     except SliverCommandError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -2,138 +2,140 @@
 Implant generation endpoints
 """
 
+import asyncio
 import logging
-import hashlib
-from datetime import datetime, timezone
+from typing import Optional, Set
+from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request, BackgroundTasks
+from arq.connections import ArqRedis
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import StreamingResponse
-from sqlalchemy.ext.asyncio import AsyncSession
-import io
 
-from app.api.deps import get_sliver, require_permission, get_db
+from app.api.deps import get_client_ip, get_sliver, require_permission
 from app.services.sliver_client import SliverManager
-from app.models import User, AuditLog
-from app.schemas.implant import ImplantGenerateRequest, ImplantResponse
+from app.services.implant_store import ImplantStore, get_implant_store
+from app.services.redis_client import get_job_queue
+from app.services.batch_writer import audit_logger
+from app.services.implant_builder import build_implant_task
+from app.models import User
+from app.schemas.implant import (
+    ImplantGenerateRequest,
+    ImplantJobAccepted,
+    ImplantJobResponse,
+)
 from app.schemas.common import MessageResponse
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# In-memory cache for generated implants (in production, use Redis or file storage)
-_implant_cache: dict = {}
+# In-process builds when running without Redis/arq; referenced until done
+_local_builds: Set[asyncio.Task] = set()
 
 
-@router.post("/generate", response_model=ImplantResponse)
+def _local_build_done(task: asyncio.Task) -> None:
+    _local_builds.discard(task)
+    # build_implant_task already logged and recorded any failure; retrieve
+    # the exception so asyncio doesn't report it as never retrieved
+    if not task.cancelled():
+        task.exception()
+
+
+@router.post(
+    "/generate",
+    response_model=ImplantJobAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def generate_implant(
     config: ImplantGenerateRequest,
-    request: Request,
-    background_tasks: BackgroundTasks,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("implants", "write")),
-    db: AsyncSession = Depends(get_db),
+    store: ImplantStore = Depends(get_implant_store),
+    queue: Optional[ArqRedis] = Depends(get_job_queue),
 ):
     """
-    Generate a new implant
+    Queue generation of a new implant
 
-    This is a synchronous operation that may take some time depending on
-    the implant configuration.
+    Building an implant can take minutes, so it runs on the background
+    worker; poll status_url until the job is done to get the download URL.
     """
-    logger.info(f"Generating implant: {config.name} ({config.os}/{config.arch})")
-
-    # Generate implant
-    implant_data = await sliver.generate_implant(config.model_dump())
-
-    # Calculate hashes
-    md5_hash = hashlib.md5(implant_data).hexdigest()
-    sha256_hash = hashlib.sha256(implant_data).hexdigest()
-
-    # Determine filename
-    ext_map = {
-        "exe": ".exe",
-        "dll": ".dll",
-        "shellcode": ".bin",
-        "shared": ".so" if config.os == "linux" else ".dylib",
-        "service": ".exe",
-    }
-    ext = ext_map.get(config.format, "")
-    filename = f"{config.name}{ext}"
-
-    # Cache implant for download
-    cache_key = f"{config.name}_{md5_hash[:8]}"
-    _implant_cache[cache_key] = {
-        "data": implant_data,
-        "filename": filename,
-        "generated_at": datetime.now(timezone.utc),
-    }
-
-    # Audit log
-    audit = AuditLog(
-        user_id=user.id,
-        action="generate",
-        resource="implants",
-        resource_id=config.name,
-        details={
-            "os": config.os,
-            "arch": config.arch,
-            "format": config.format,
-            "size": len(implant_data),
-            "md5": md5_hash,
-        },
-        ip_address=request.client.host if request.client else None,
-    )
-    db.add(audit)
-
-    logger.info(f"Implant generated: {filename} ({len(implant_data)} bytes)")
-
-    return ImplantResponse(
-        name=config.name,
-        filename=filename,
-        os=config.os,
-        arch=config.arch,
-        format=config.format,
-        size=len(implant_data),
-        md5=md5_hash,
-        sha256=sha256_hash,
-        generated_at=datetime.now(timezone.utc),
-        download_url=f"/api/v1/implants/{cache_key}/download",
+    job_id = uuid4().hex
+    await store.set_job(job_id, "queued")
+
+    if queue is not None:
+        await queue.enqueue_job(
+            "build_implant_task",
+            config.model_dump(),
+            user.id,
+            ip_address,
+            _job_id=job_id,
+        )
+    else:
+        task = asyncio.create_task(build_implant_task(
+            {"job_id": job_id}, config.model_dump(), user.id, ip_address,
+        ))
+        _local_builds.add(task)
+        task.add_done_callback(_local_build_done)
+
+    logger.info(f"Queued implant generation: {config.name} (job {job_id})")
+
+    return ImplantJobAccepted(
+        job_id=job_id,
+        status_url=f"/api/v1/implants/jobs/{job_id}",
     )
 
 
+@router.get("/jobs/{job_id}", response_model=ImplantJobResponse)
+async def get_implant_job(
+    job_id: str,
+    user: User = Depends(require_permission("implants", "read")),
+    store: ImplantStore = Depends(get_implant_store),
+):
+    """
+    Get the status of an implant generation job
+    """
+    job = await store.get_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found or expired",
+        )
+    return job
+
+
 @router.get("/{implant_key}/download")
 async def download_implant(
     implant_key: str,
-    request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     user: User = Depends(require_permission("implants", "read")),
-    db: AsyncSession = Depends(get_db),
+    store: ImplantStore = Depends(get_implant_store),
 ):
     """
     Download a generated implant
     """
-    if implant_key not in _implant_cache:
+    meta = await store.get_meta(implant_key)
+    if meta is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Implant not found or expired",
         )
 
-    cached = _implant_cache[implant_key]
-
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="download",
         resource="implants",
         resource_id=implant_key,
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return StreamingResponse(
-        io.BytesIO(cached["data"]),
+        store.iter_chunks(implant_key, meta["size"]),
         media_type="application/octet-stream",
         headers={
-            "Content-Disposition": f'attachment; filename="{cached["filename"]}"'
+            "Content-Disposition": f'attachment; filename="{meta["filename"]}"',
+            "Content-Length": str(meta["size"]),
         },
     )
 
@@ -142,12 +144,12 @@ async def download_implant(
 async def delete_implant(
     implant_key: str,
     user: User = Depends(require_permission("implants", "delete")),
+    store: ImplantStore = Depends(get_implant_store),
 ):
     """
     Delete a cached implant
     """
-    if implant_key in _implant_cache:
-        del _implant_cache[implant_key]
+    if await store.delete(implant_key):
         return MessageResponse(message=f"Implant {implant_key} deleted")
 
     raise HTTPException(
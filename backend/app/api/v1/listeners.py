@@ -4,13 +4,15 @@ Listener management endpoints
 
 import logging
 from datetime import datetime, timezone
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, status
 
-from app.api.deps import get_sliver, require_permission, get_db
+from app.api.deps import get_client_ip, get_sliver, require_permission
 from app.services.sliver_client import SliverManager
-from app.models import User, AuditLog
+from app.services.batch_writer import audit_logger
+from app.core.responses import ORJSONResponse
+from app.models import User
 from app.schemas.listener import (
     ListenerResponse,
     ListenerList,
@@ -36,38 +38,40 @@ async def list_listeners(
     """
     jobs = await sliver.get_jobs()
 
+    # Jobs don't have a timestamp; report them all as of now
+    now = datetime.now(timezone.utc)
+
     listeners = []
     for job in jobs:
         # Get host - default to 0.0.0.0 if empty
         host = job.get("host", "") or "0.0.0.0"
 
-        # Get domain from job data
-        domain = job.get("domain")
-        if not domain and job.get("domains"):
-            domain = job["domains"][0] if job["domains"] else None
+        # Get domain from job data, falling back to the first DNS domain
+        domains = job.get("domains") or ()
+        domain = job.get("domain") or (domains[0] if domains else None)
 
-        listeners.append(
-            ListenerResponse(
-                id=job["id"],
-                name=job.get("name", ""),
-                protocol=job.get("protocol", "unknown"),
-                host=host,
-                port=job.get("port", 0),
-                domain=domain,
-                started_at=datetime.now(timezone.utc),  # Jobs don't have timestamp
-            )
-        )
+        # Plain dicts in ListenerResponse shape, serialized with orjson
+        listeners.append({
+            "id": job["id"],
+            "name": job.get("name", ""),
+            "protocol": job.get("protocol", "unknown"),
+            "host": host,
+            "port": job.get("port", 0),
+            "started_at": now,
+            "domain": domain,
+            "website": None,
+            "cert_path": None,
+        })
 
-    return ListenerList(listeners=listeners, total=len(listeners))
+    return ORJSONResponse({"listeners": listeners, "total": len(listeners)})
 
 
 @router.post("/mtls", response_model=ListenerResponse)
 async def start_mtls_listener(
     listener_config: MTLSListenerRequest,
-    request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("listeners", "write")),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     Start mTLS listener
@@ -78,7 +82,7 @@ async def start_mtls_listener(
     )
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="start",
         resource="listeners",
@@ -88,13 +92,12 @@ async def start_mtls_listener(
             "host": listener_config.host,
             "port": listener_config.port,
         },
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return ListenerResponse(
         id=job["id"],
-        name=job.get("name", f"mtls-{listener_config.port}"),
+        name=job.get("name") or f"mtls-{listener_config.port}",
         protocol="mtls",
         host=listener_config.host,
         port=listener_config.port,
@@ -105,10 +108,9 @@ async def start_mtls_listener(
 @router.post("/https", response_model=ListenerResponse)
 async def start_https_listener(
     listener_config: HTTPSListenerRequest,
-    request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("listeners", "write")),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     Start HTTPS listener
@@ -123,7 +125,7 @@ async def start_https_listener(
     )
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="start",
         resource="listeners",
@@ -133,13 +135,12 @@ async def start_https_listener(
             "domain": listener_config.domain,
             "port": listener_config.port,
         },
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return ListenerResponse(
         id=job["id"],
-        name=job.get("name", f"https-{listener_config.port}"),
+        name=job.get("name") or f"https-{listener_config.port}",
         protocol="https",
         host=listener_config.host,
         port=listener_config.port,
@@ -151,10 +152,9 @@ async def start_https_listener(
 @router.post("/http", response_model=ListenerResponse)
 async def start_http_listener(
     listener_config: HTTPListenerRequest,
-    request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("listeners", "write")),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     Start HTTP listener
@@ -167,7 +167,7 @@ async def start_http_listener(
     )
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="start",
         resource="listeners",
@@ -176,13 +176,12 @@ async def start_http_listener(
             "protocol": "http",
             "port": listener_config.port,
         },
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return ListenerResponse(
         id=job["id"],
-        name=job.get("name", f"http-{listener_config.port}"),
+        name=job.get("name") or f"http-{listener_config.port}",
         protocol="http",
         host=listener_config.host,
         port=listener_config.port,
@@ -193,10 +192,9 @@ async def start_http_listener(
 @router.post("/dns", response_model=ListenerResponse)
 async def start_dns_listener(
     listener_config: DNSListenerRequest,
-    request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("listeners", "write")),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     Start DNS listener
@@ -209,7 +207,7 @@ async def start_dns_listener(
     )
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="start",
         resource="listeners",
@@ -219,13 +217,12 @@ async def start_dns_listener(
             "domains": listener_config.domains,
             "port": listener_config.port,
         },
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return ListenerResponse(
         id=job["id"],
-        name=job.get("name", f"dns-{listener_config.port}"),
+        name=job.get("name") or f"dns-{listener_config.port}",
         protocol="dns",
         host=listener_config.host,
         port=listener_config.port,
@@ -235,25 +232,23 @@ async def start_dns_listener(
 
 @router.delete("/{job_id}", response_model=MessageResponse)
 async def stop_listener(
-    job_id: str,
-    request: Request,
+    job_id: int,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("listeners", "delete")),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     Stop a listener (kill job)
     """
-    await sliver.kill_job(int(job_id))
+    await sliver.kill_job(job_id)
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="stop",
         resource="listeners",
-        resource_id=job_id,
-        ip_address=request.client.host if request.client else None,
+        resource_id=str(job_id),
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return MessageResponse(message=f"Listener {job_id} stopped")
@@ -2,19 +2,46 @@
 Session notes and tags endpoints
 """
 
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional
+
+import orjson
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, exists, func, lambda_stmt, literal, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import selectinload
 from pydantic import BaseModel
 
 from app.api.deps import get_db, require_permission
+from app.core.config import settings
+from app.core.responses import ORJSONResponse
 from app.models import User, SessionNote, Tag, SessionTag, CommandHistory
+from app.services.batch_writer import history_writer
+from app.services.database import async_session_maker, fetch_all_concurrently, is_sqlite
+from app.services.redis_client import (
+    redis_get_json,
+    redis_invalidate,
+    redis_invalidate_prefix,
+    redis_set_json,
+)
 
 router = APIRouter()
 
+# Redis keys for cached tag listings
+TAGS_CACHE_KEY = "tags:all"
+SESSION_TAGS_CACHE_PREFIX = "session_tags:"
+
+# Command history rows fetched per round-trip when streaming an export
+EXPORT_HISTORY_BATCH = 200
+
+
+def _session_tags_cache_key(session_type: str, session_id: str) -> str:
+    return f"{SESSION_TAGS_CACHE_PREFIX}{session_type}:{session_id}"
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # Schemas
@@ -67,6 +94,13 @@ class SessionTagCreate(BaseModel):
     tag_id: int
 
 
+class HistoryCreate(BaseModel):
+    command: str
+    output: Optional[str] = None
+    exit_code: Optional[int] = None
+    session_type: str = "session"
+
+
 class CommandHistoryResponse(BaseModel):
     id: int
     session_id: str
@@ -88,31 +122,51 @@ class CommandHistoryResponse(BaseModel):
 async def get_session_notes(
     session_id: str,
     session_type: str = Query("session"),
+    before: Optional[datetime] = Query(None, description="Cursor: created_at of the last note seen"),
+    before_id: Optional[int] = Query(None, description="Cursor: id of the last note seen"),
+    limit: int = Query(50, ge=1, le=200),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(require_permission("sessions", "read")),
 ):
-    """Get all notes for a session"""
-    result = await db.execute(
-        select(SessionNote)
+    """
+    Get notes for a session, newest first
+
+    Keyset-paginated: pass the created_at and id of the last note of a page
+    as before/before_id to get the next one.
+    """
+    # lambda_stmt caches the constructed statement; only the values rebind
+    stmt = lambda_stmt(
+        lambda: select(
+            SessionNote.id,
+            SessionNote.session_id,
+            SessionNote.session_type,
+            SessionNote.content,
+            SessionNote.user_id,
+            func.coalesce(User.username, "Unknown").label("username"),
+            SessionNote.created_at,
+            SessionNote.updated_at,
+        )
+        .outerjoin(User, User.id == SessionNote.user_id)
         .where(SessionNote.session_id == session_id)
         .where(SessionNote.session_type == session_type)
-        .order_by(SessionNote.created_at.desc())
+        .order_by(SessionNote.created_at.desc(), SessionNote.id.desc())
+        .limit(limit)
     )
-    notes = result.scalars().all()
-
-    return [
-        NoteResponse(
-            id=note.id,
-            session_id=note.session_id,
-            session_type=note.session_type,
-            content=note.content,
-            user_id=note.user_id,
-            username=note.user.username if note.user else "Unknown",
-            created_at=note.created_at,
-            updated_at=note.updated_at,
-        )
-        for note in notes
-    ]
+    if before is not None:
+        # Stored timestamps are naive UTC
+        if before.tzinfo is not None:
+            before = before.astimezone(timezone.utc).replace(tzinfo=None)
+        if before_id is None:
+            stmt += lambda s: s.where(SessionNote.created_at < before)
+        else:
+            stmt += lambda s: s.where(
+                tuple_(SessionNote.created_at, SessionNote.id) < tuple_(before, before_id)
+            )
+
+    result = await db.execute(stmt)
+    # Rows already have the response shape; returning the response directly
+    # skips FastAPI's outbound validation (response_model stays for the docs)
+    return ORJSONResponse([dict(row._mapping) for row in result])
 
 
 @router.post("/sessions/{session_id}/notes", response_model=NoteResponse)
@@ -129,9 +183,10 @@ async def create_note(
         user_id=user.id,
         content=note_data.content,
     )
+    # id comes back from the INSERT and the timestamps are set client-side,
+    # so the committed object needs no refresh
     db.add(note)
     await db.commit()
-    await db.refresh(note)
 
     return NoteResponse(
         id=note.id,
@@ -153,27 +208,21 @@ async def update_note(
     user: User = Depends(require_permission("sessions", "write")),
 ):
     """Update a note"""
-    result = await db.execute(select(SessionNote).where(SessionNote.id == note_id))
+    result = await db.execute(
+        update(SessionNote)
+        .where(SessionNote.id == note_id)
+        # updated_at is stamped by the database (onupdate) and returned
+        .values(content=note_data.content)
+        .returning(SessionNote)
+        .options(selectinload(SessionNote.user))
+    )
     note = result.scalar_one_or_none()
 
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
-
-    note.content = note_data.content
-    note.updated_at = datetime.utcnow()
     await db.commit()
-    await db.refresh(note)
 
-    return NoteResponse(
-        id=note.id,
-        session_id=note.session_id,
-        session_type=note.session_type,
-        content=note.content,
-        user_id=note.user_id,
-        username=note.user.username if note.user else "Unknown",
-        created_at=note.created_at,
-        updated_at=note.updated_at,
-    )
+    return NoteResponse.model_validate(note)
 
 
 @router.delete("/notes/{note_id}")
@@ -183,7 +232,11 @@ async def delete_note(
     user: User = Depends(require_permission("sessions", "write")),
 ):
     """Delete a note"""
-    await db.execute(delete(SessionNote).where(SessionNote.id == note_id))
+    result = await db.execute(
+        delete(SessionNote).where(SessionNote.id == note_id).returning(SessionNote.id)
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Note not found")
     await db.commit()
     return {"message": "Note deleted"}
 
@@ -198,9 +251,20 @@ async def list_tags(
     user: User = Depends(require_permission("sessions", "read")),
 ):
     """List all tags"""
-    result = await db.execute(select(Tag).order_by(Tag.name))
-    tags = result.scalars().all()
-    return [TagResponse.model_validate(tag) for tag in tags]
+    tags = await redis_get_json(TAGS_CACHE_KEY)
+    if tags is None:
+        result = await db.execute(select(Tag).order_by(Tag.name))
+        # Sorted here too, so the order matches the after comparison below
+        # whatever the database collation
+        tags = sorted(
+            (
+                TagResponse.model_validate(tag).model_dump(mode="json")
+                for tag in result.scalars().all()
+            ),
+            key=lambda tag: tag["name"],
+        )
+        await redis_set_json(TAGS_CACHE_KEY, tags, settings.tag_cache_ttl_seconds)
+    return ORJSONResponse(tags)
 
 
 @router.post("/tags", response_model=TagResponse)
@@ -211,8 +275,8 @@ async def create_tag(
 ):
     """Create a new tag"""
     # Check if tag exists
-    result = await db.execute(select(Tag).where(Tag.name == tag_data.name))
-    if result.scalar_one_or_none():
+    result = await db.execute(select(exists().where(Tag.name == tag_data.name)))
+    if result.scalar():
         raise HTTPException(status_code=400, detail="Tag already exists")
 
     tag = Tag(
@@ -222,7 +286,7 @@ async def create_tag(
     )
     db.add(tag)
     await db.commit()
-    await db.refresh(tag)
+    await redis_invalidate(TAGS_CACHE_KEY)
 
     return TagResponse.model_validate(tag)
 
@@ -234,10 +298,22 @@ async def delete_tag(
     user: User = Depends(require_permission("sessions", "write")),
 ):
     """Delete a tag"""
-    # Delete associations first
-    await db.execute(delete(SessionTag).where(SessionTag.tag_id == tag_id))
-    await db.execute(delete(Tag).where(Tag.id == tag_id))
+    stmt = delete(Tag).where(Tag.id == tag_id).returning(Tag.id)
+    delete_associations = delete(SessionTag).where(SessionTag.tag_id == tag_id)
+    if is_sqlite:
+        # SQLite doesn't enforce the ON DELETE CASCADE foreign key and has no
+        # DML in CTEs, so delete associations separately
+        await db.execute(delete_associations)
+    else:
+        # Also covers databases created before the foreign key cascaded
+        stmt = stmt.add_cte(delete_associations.cte("deleted_associations"))
+    result = await db.execute(stmt)
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Tag not found")
     await db.commit()
+    # The tag may be cached in any session's listing
+    await redis_invalidate(TAGS_CACHE_KEY)
+    await redis_invalidate_prefix(SESSION_TAGS_CACHE_PREFIX)
     return {"message": "Tag deleted"}
 
 
@@ -245,18 +321,43 @@ async def delete_tag(
 async def get_session_tags(
     session_id: str,
     session_type: str = Query("session"),
+    after: Optional[str] = Query(None, description="Cursor: name of the last tag seen"),
+    limit: int = Query(50, ge=1, le=200),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(require_permission("sessions", "read")),
 ):
-    """Get tags for a session"""
-    result = await db.execute(
-        select(Tag)
-        .join(SessionTag)
-        .where(SessionTag.session_id == session_id)
-        .where(SessionTag.session_type == session_type)
-    )
-    tags = result.scalars().all()
-    return [TagResponse.model_validate(tag) for tag in tags]
+    """
+    Get tags for a session, by name
+
+    Paginated by name: pass the last tag of a page as after to get the next.
+    The cache holds the session's full (short) tag list; pages are cut from it.
+    """
+    cache_key = _session_tags_cache_key(session_type, session_id)
+    tags = await redis_get_json(cache_key)
+    if tags is None:
+        # Semi-join on the association index, no duplicate Tag rows
+        result = await db.execute(lambda_stmt(
+            lambda: select(Tag)
+            .where(Tag.id.in_(
+                select(SessionTag.tag_id)
+                .where(SessionTag.session_id == session_id)
+                .where(SessionTag.session_type == session_type)
+            ))
+            .order_by(Tag.name)
+        ))
+        # Sorted here too, so the order matches the after comparison below
+        # whatever the database collation
+        tags = sorted(
+            (
+                TagResponse.model_validate(tag).model_dump(mode="json")
+                for tag in result.scalars().all()
+            ),
+            key=lambda tag: tag["name"],
+        )
+        await redis_set_json(cache_key, tags, settings.tag_cache_ttl_seconds)
+    if after is not None:
+        tags = [tag for tag in tags if tag["name"] > after]
+    return ORJSONResponse(tags[:limit])
 
 
 @router.post("/sessions/{session_id}/tags/{tag_id}")
@@ -268,27 +369,26 @@ async def add_tag_to_session(
     user: User = Depends(require_permission("sessions", "write")),
 ):
     """Add a tag to a session"""
-    # Check if tag exists
-    result = await db.execute(select(Tag).where(Tag.id == tag_id))
-    if not result.scalar_one_or_none():
-        raise HTTPException(status_code=404, detail="Tag not found")
-
-    # Check if already tagged
+    # Insert selected from the tag row, so a missing tag inserts nothing, and
+    # let the unique index skip associations that already exist
+    insert_fn = sqlite_insert if is_sqlite else pg_insert
     result = await db.execute(
-        select(SessionTag)
-        .where(SessionTag.session_id == session_id)
-        .where(SessionTag.tag_id == tag_id)
+        insert_fn(SessionTag)
+        .from_select(
+            ["session_id", "session_type", "tag_id"],
+            select(literal(session_id), literal(session_type), Tag.id).where(Tag.id == tag_id),
+        )
+        .on_conflict_do_nothing(index_elements=["session_id", "session_type", "tag_id"])
+        .returning(SessionTag.id)
     )
-    if result.scalar_one_or_none():
+    if result.first() is None:
+        # Nothing inserted: tell an unknown tag apart from an existing association
+        if not (await db.execute(select(exists().where(Tag.id == tag_id)))).scalar():
+            raise HTTPException(status_code=404, detail="Tag not found")
         return {"message": "Tag already added"}
 
-    session_tag = SessionTag(
-        session_id=session_id,
-        session_type=session_type,
-        tag_id=tag_id,
-    )
-    db.add(session_tag)
     await db.commit()
+    await redis_invalidate(_session_tags_cache_key(session_type, session_id))
 
     return {"message": "Tag added"}
 
@@ -302,13 +402,17 @@ async def remove_tag_from_session(
     user: User = Depends(require_permission("sessions", "write")),
 ):
     """Remove a tag from a session"""
-    await db.execute(
+    result = await db.execute(
         delete(SessionTag)
         .where(SessionTag.session_id == session_id)
         .where(SessionTag.tag_id == tag_id)
         .where(SessionTag.session_type == session_type)
+        .returning(SessionTag.id)
     )
+    if result.first() is None:
+        raise HTTPException(status_code=404, detail="Tag not on this session")
     await db.commit()
+    await redis_invalidate(_session_tags_cache_key(session_type, session_id))
     return {"message": "Tag removed"}
 
 
@@ -324,102 +428,109 @@ async def get_command_history(
     user: User = Depends(require_permission("sessions", "read")),
 ):
     """Get command history for a session"""
-    result = await db.execute(
-        select(CommandHistory)
+    result = await db.execute(lambda_stmt(
+        lambda: select(
+            CommandHistory.id,
+            CommandHistory.session_id,
+            CommandHistory.command,
+            CommandHistory.output,
+            CommandHistory.exit_code,
+            func.coalesce(User.username, "Unknown").label("username"),
+            CommandHistory.executed_at,
+        )
+        .outerjoin(User, User.id == CommandHistory.user_id)
         .where(CommandHistory.session_id == session_id)
         .order_by(CommandHistory.executed_at.desc())
         .limit(limit)
-    )
-    history = result.scalars().all()
-
-    return [
-        CommandHistoryResponse(
-            id=cmd.id,
-            session_id=cmd.session_id,
-            command=cmd.command,
-            output=cmd.output,
-            exit_code=cmd.exit_code,
-            username=cmd.user.username if cmd.user else "Unknown",
-            executed_at=cmd.executed_at,
-        )
-        for cmd in history
-    ]
+    ))
+    # Rows already have the response shape, skip outbound validation
+    return ORJSONResponse([dict(row._mapping) for row in result])
 
 
-@router.post("/sessions/{session_id}/history")
+@router.post("/sessions/{session_id}/history", status_code=status.HTTP_202_ACCEPTED)
 async def save_command_history(
     session_id: str,
-    command: str,
-    output: Optional[str] = None,
-    exit_code: Optional[int] = None,
-    session_type: str = Query("session"),
-    db: AsyncSession = Depends(get_db),
+    history_data: HistoryCreate,
     user: User = Depends(require_permission("sessions", "execute")),
 ):
-    """Save a command to history"""
-    history = CommandHistory(
+    """Queue a command for saving to history"""
+    history_writer.record(
         session_id=session_id,
-        session_type=session_type,
+        session_type=history_data.session_type,
         user_id=user.id,
-        command=command,
-        output=output,
-        exit_code=exit_code,
+        command=history_data.command,
+        output=history_data.output,
+        exit_code=history_data.exit_code,
     )
-    db.add(history)
-    await db.commit()
 
-    return {"message": "Command saved to history"}
+    return {"message": "Command queued for history"}
+
+
+async def _stream_export(session_id: str, notes: list, tags: List[str]) -> AsyncIterator[bytes]:
+    """Yield the export document, streaming command history in batches"""
+    yield b'{"session_id":' + orjson.dumps(session_id)
+    yield b',"notes":' + orjson.dumps(notes)
+    yield b',"tags":' + orjson.dumps(tags)
+    yield b',"command_history":['
+
+    # Command output can be large, so history is read through a server-side
+    # cursor on its own session (the request's session is gone by now)
+    async with async_session_maker() as db:
+        rows = await db.stream(
+            select(
+                CommandHistory.command,
+                CommandHistory.output,
+                CommandHistory.exit_code,
+                User.username,
+                CommandHistory.executed_at,
+            )
+            .outerjoin(User, User.id == CommandHistory.user_id)
+            .where(CommandHistory.session_id == session_id)
+            .order_by(CommandHistory.executed_at)
+            .execution_options(yield_per=EXPORT_HISTORY_BATCH)
+        )
+        separator = b""
+        async for batch in rows.partitions():
+            chunk = bytearray()
+            for command, output, exit_code, username, executed_at in batch:
+                chunk += separator
+                chunk += orjson.dumps({
+                    "command": command,
+                    "output": output,
+                    "exit_code": exit_code,
+                    "user": username or "Unknown",
+                    "executed_at": executed_at,
+                })
+                separator = b","
+            yield bytes(chunk)
+
+    yield b'],"exported_at":' + orjson.dumps(datetime.utcnow()) + b"}"
 
 
 @router.get("/sessions/{session_id}/export")
 async def export_session_data(
     session_id: str,
-    db: AsyncSession = Depends(get_db),
     user: User = Depends(require_permission("sessions", "read")),
 ):
     """Export all session data (notes, tags, history)"""
-    # Get notes
-    notes_result = await db.execute(
-        select(SessionNote).where(SessionNote.session_id == session_id)
-    )
-    notes = [
-        {
-            "content": n.content,
-            "user": n.user.username if n.user else "Unknown",
-            "created_at": n.created_at.isoformat(),
-        }
-        for n in notes_result.scalars().all()
-    ]
-
-    # Get tags
-    tags_result = await db.execute(
-        select(Tag)
+    # Notes and tags are small; read them concurrently up front
+    note_rows, tag_rows = await fetch_all_concurrently(
+        select(
+            SessionNote.content,
+            func.coalesce(User.username, "Unknown").label("user"),
+            SessionNote.created_at,
+        )
+        .outerjoin(User, User.id == SessionNote.user_id)
+        .where(SessionNote.session_id == session_id),
+        select(Tag.name)
         .join(SessionTag)
-        .where(SessionTag.session_id == session_id)
+        .where(SessionTag.session_id == session_id),
     )
-    tags = [t.name for t in tags_result.scalars().all()]
 
-    # Get history
-    history_result = await db.execute(
-        select(CommandHistory)
-        .where(CommandHistory.session_id == session_id)
-        .order_by(CommandHistory.executed_at)
+    notes = [dict(row._mapping) for row in note_rows]
+    tags = [name for (name,) in tag_rows]
+
+    return StreamingResponse(
+        _stream_export(session_id, notes, tags),
+        media_type="application/json",
     )
-    history = [
-        {
-            "command": h.command,
-            "output": h.output,
-            "exit_code": h.exit_code,
-            "user": h.user.username if h.user else "Unknown",
-            "executed_at": h.executed_at.isoformat(),
-        }
-        for h in history_result.scalars().all()
-    ]
-
-    return {
-        "session_id": session_id,
-        "notes": notes,
-        "tags": tags,
-        "command_history": history,
-        "exported_at": datetime.utcnow().isoformat(),
-    }
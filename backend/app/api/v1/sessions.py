@@ -2,18 +2,27 @@
 Session management endpoints
 """
 
+import asyncio
 import logging
+import shlex
 from datetime import datetime, timezone
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
-from fastapi.responses import StreamingResponse
-from sqlalchemy.ext.asyncio import AsyncSession
-import io
-
-from app.api.deps import get_sliver, require_permission, get_db, get_current_user
+from fastapi.responses import Response, StreamingResponse
+
+from app.api.deps import (
+    get_client_ip,
+    get_current_user,
+    get_session_or_404,
+    get_sliver,
+    require_permission,
+)
+from app.core.config import settings
+from app.core.responses import ORJSONResponse
+from app.services.batch_writer import audit_logger
 from app.services.sliver_client import SliverManager
-from app.models import User, AuditLog
+from app.models import User
 from app.schemas.session import (
     SessionResponse,
     SessionList,
@@ -21,6 +30,7 @@ from app.schemas.session import (
     ShellResponse,
     ProcessList,
     DirectoryListing,
+    FileBatchRequest,
 )
 from app.schemas.common import MessageResponse
 
@@ -28,6 +38,87 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Slice size when streaming downloads/screenshots back to the client
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_SESSION_FIELDS = {
+    name: None if field.is_required() else field.default
+    for name, field in SessionResponse.model_fields.items()
+}
+
+# Shell command templates per implant OS; anything that isn't Windows gets
+# the POSIX form, with the path shell-quoted
+KILL_CMD = {
+    "windows": "taskkill /F /PID {pid}",
+    "posix": "kill -9 {pid}",
+}
+MKDIR_CMD = {
+    "windows": 'mkdir "{path}"',
+    "posix": "mkdir -p {path}",
+}
+DELETE_CMD = {
+    "windows": 'del /F /Q "{path}" 2>nul || rmdir /S /Q "{path}"',
+    "posix": "rm -rf {path}",
+}
+
+
+# Batched operations: template, target argument and required permission
+_BATCH_OPS = {
+    "kill": (KILL_CMD, "pid", ("sessions", "execute")),
+    "mkdir": (MKDIR_CMD, "path", ("files", "write")),
+    "delete": (DELETE_CMD, "path", ("files", "delete")),
+}
+# Batched commands are independent, so run each regardless of the last
+_BATCH_SEPARATOR = {"windows": " & ", "posix": " ; "}
+
+
+def _shell_command(templates: dict, session: dict, **args) -> str:
+    """Fill in the command template for the session's OS"""
+    if session.get("os", "").lower() == "windows":
+        return templates["windows"].format(**args)
+    if "path" in args:
+        args["path"] = shlex.quote(args["path"])
+    return templates["posix"].format(**args)
+
+
+def _session_payload(session: dict) -> dict:
+    """
+    Shape a trusted session dict like SessionResponse without validating it
+
+    Sliver reports the check-in time as a unix timestamp; convert it to a UTC
+    datetime as SessionResponse validation would.
+    """
+    payload = {name: session.get(name, default) for name, default in _SESSION_FIELDS.items()}
+    value = payload["last_checkin"]
+    if isinstance(value, (int, float)):
+        payload["last_checkin"] = datetime.fromtimestamp(value, tz=timezone.utc)
+    return payload
+
+
+async def _iter_chunks(data: bytes) -> AsyncIterator[bytes]:
+    """Yield data in STREAM_CHUNK_SIZE slices instead of copying it whole"""
+    view = memoryview(data)
+    for offset in range(0, len(view), STREAM_CHUNK_SIZE):
+        yield bytes(view[offset:offset + STREAM_CHUNK_SIZE])
+
+
+def _bytes_response(
+    data: bytes, media_type: str, headers: Optional[dict] = None
+) -> Response:
+    """
+    Send a payload that is already in memory
+
+    Anything that fits in one chunk goes out as a plain Response; only larger
+    payloads pay for the streaming iterator.
+    """
+    if len(data) <= STREAM_CHUNK_SIZE:
+        return Response(content=data, media_type=media_type, headers=headers)
+    return StreamingResponse(
+        _iter_chunks(data),
+        media_type=media_type,
+        headers={**(headers or {}), "Content-Length": str(len(data))},
+    )
+
 
 @router.get("", response_model=SessionList)
 async def list_sessions(
@@ -38,60 +129,47 @@ async def list_sessions(
     List all active sessions
     """
     sessions = await sliver.get_sessions()
-    return SessionList(
-        sessions=[SessionResponse(**s) for s in sessions],
-        total=len(sessions),
-    )
+    # Server-side data; skip per-field response validation
+    return ORJSONResponse({
+        "sessions": [_session_payload(s) for s in sessions],
+        "total": len(sessions),
+    })
 
 
 @router.get("/{session_id}", response_model=SessionResponse)
 async def get_session(
     session_id: str,
-    sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("sessions", "read")),
+    session: dict = Depends(get_session_or_404),
 ):
     """
     Get session details
     """
-    session = await sliver.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found",
-        )
     return SessionResponse(**session)
 
 
 @router.delete("/{session_id}", response_model=MessageResponse)
 async def kill_session(
     session_id: str,
-    request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("sessions", "delete")),
-    db: AsyncSession = Depends(get_db),
+    session: dict = Depends(get_session_or_404),
 ):
     """
     Kill a session
     """
-    session = await sliver.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found",
-        )
-
     await sliver.kill_session(session_id)
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="kill",
         resource="sessions",
         resource_id=session_id,
         details={"hostname": session.get("hostname")},
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return MessageResponse(message=f"Session {session_id} killed")
 
@@ -100,21 +178,14 @@ async def kill_session(
 async def execute_shell(
     session_id: str,
     shell_request: ShellRequest,
-    request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("sessions", "execute")),
-    db: AsyncSession = Depends(get_db),
+    session: dict = Depends(get_session_or_404),
 ):
     """
     Execute shell command on session
     """
-    session = await sliver.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found",
-        )
-
     result = await sliver.session_shell(
         session_id,
         shell_request.command,
@@ -122,7 +193,7 @@ async def execute_shell(
     )
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="shell",
         resource="sessions",
@@ -131,9 +202,8 @@ async def execute_shell(
             "command": shell_request.command[:500],  # Truncate for safety
             "hostname": session.get("hostname"),
         },
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return ShellResponse(
         output=result.get("output", ""),
@@ -148,17 +218,11 @@ async def list_processes(
     session_id: str,
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("sessions", "read")),
+    session: dict = Depends(get_session_or_404),
 ):
     """
     List processes on session
     """
-    session = await sliver.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found",
-        )
-
     processes = await sliver.session_ps(session_id)
     return ProcessList(processes=processes, total=len(processes))
 
@@ -167,40 +231,28 @@ async def list_processes(
 async def kill_process(
     session_id: str,
     pid: int,
-    request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("sessions", "execute")),
-    db: AsyncSession = Depends(get_db),
+    session: dict = Depends(get_session_or_404),
 ):
     """
     Kill a process on session
     """
-    session = await sliver.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found",
-        )
-
     # Execute kill command
-    os_type = session.get("os", "").lower()
-    if os_type == "windows":
-        command = f"taskkill /F /PID {pid}"
-    else:
-        command = f"kill -9 {pid}"
+    command = _shell_command(KILL_CMD, session, pid=pid)
 
     await sliver.session_shell(session_id, command)
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="kill_process",
         resource="sessions",
         resource_id=session_id,
         details={"pid": pid},
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return MessageResponse(message=f"Process {pid} killed")
 
@@ -211,17 +263,11 @@ async def list_files(
     path: str = Query(..., description="Directory path"),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("files", "read")),
+    session: dict = Depends(get_session_or_404),
 ):
     """
     List files in directory
     """
-    session = await sliver.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found",
-        )
-
     result = await sliver.session_ls(session_id, path)
     return DirectoryListing(**result)
 
@@ -230,39 +276,31 @@ async def list_files(
 async def download_file(
     session_id: str,
     path: str = Query(..., description="File path to download"),
-    request: Request = None,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("files", "read")),
-    db: AsyncSession = Depends(get_db),
+    session: dict = Depends(get_session_or_404),
 ):
     """
     Download file from session
     """
-    session = await sliver.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found",
-        )
-
     data = await sliver.session_download(session_id, path)
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="download",
         resource="files",
         resource_id=session_id,
         details={"path": path, "size": len(data)},
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     # Get filename from path
-    filename = path.split("/")[-1].split("\\")[-1]
+    filename = path.replace("\\", "/").rsplit("/", 1)[-1]
 
-    return StreamingResponse(
-        io.BytesIO(data),
+    return _bytes_response(
+        data,
         media_type="application/octet-stream",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
@@ -277,17 +315,11 @@ async def list_pivots(
     session_id: str,
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("sessions", "read")),
+    session: dict = Depends(get_session_or_404),
 ):
     """
     List all active pivots (SOCKS and port forwards) for a session
     """
-    session = await sliver.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found",
-        )
-
     pivots = await sliver.list_pivots(session_id)
     return {"pivots": pivots, "total": len(pivots)}
 
@@ -296,36 +328,32 @@ async def list_pivots(
 async def start_socks_proxy(
     session_id: str,
     request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("sessions", "execute")),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     Start SOCKS5 proxy through session
     """
-    session = await sliver.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found",
-        )
-
-    body = await request.json()
+    # The session lookup and reading the body are independent
+    _, body = await asyncio.gather(
+        get_session_or_404(session_id, sliver),
+        request.json(),
+    )
     host = body.get("host", "127.0.0.1")
     port = body.get("port", 1080)
 
     result = await sliver.start_socks_proxy(session_id, host, port)
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="start_socks",
         resource="sessions",
         resource_id=session_id,
         details={"host": host, "port": port},
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return result
 
@@ -334,33 +362,25 @@ async def start_socks_proxy(
 async def stop_socks_proxy(
     session_id: str,
     tunnel_id: int,
-    request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("sessions", "execute")),
-    db: AsyncSession = Depends(get_db),
+    session: dict = Depends(get_session_or_404),
 ):
     """
     Stop SOCKS5 proxy
     """
-    session = await sliver.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found",
-        )
-
     await sliver.stop_socks_proxy(session_id, tunnel_id)
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="stop_socks",
         resource="sessions",
         resource_id=session_id,
         details={"tunnel_id": tunnel_id},
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return MessageResponse(message=f"SOCKS proxy {tunnel_id} stopped")
 
@@ -369,21 +389,18 @@ async def stop_socks_proxy(
 async def start_port_forward(
     session_id: str,
     request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("sessions", "execute")),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     Start port forwarding through session
     """
-    session = await sliver.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found",
-        )
-
-    body = await request.json()
+    # The session lookup and reading the body are independent
+    _, body = await asyncio.gather(
+        get_session_or_404(session_id, sliver),
+        request.json(),
+    )
     remote_host = body.get("remote_host")
     remote_port = body.get("remote_port")
     local_host = body.get("local_host", "127.0.0.1")
@@ -400,7 +417,7 @@ async def start_port_forward(
     )
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="start_portfwd",
         resource="sessions",
@@ -409,9 +426,8 @@ async def start_port_forward(
             "local": f"{local_host}:{local_port}",
             "remote": f"{remote_host}:{remote_port}",
         },
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return result
 
@@ -420,33 +436,25 @@ async def start_port_forward(
 async def stop_port_forward(
     session_id: str,
     tunnel_id: int,
-    request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("sessions", "execute")),
-    db: AsyncSession = Depends(get_db),
+    session: dict = Depends(get_session_or_404),
 ):
     """
     Stop port forwarding
     """
-    session = await sliver.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found",
-        )
-
     await sliver.stop_portfwd(session_id, tunnel_id)
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="stop_portfwd",
         resource="sessions",
         resource_id=session_id,
         details={"tunnel_id": tunnel_id},
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return MessageResponse(message=f"Port forward {tunnel_id} stopped")
 
@@ -460,40 +468,55 @@ async def upload_file(
     session_id: str,
     remote_path: str = Query(..., description="Remote path to upload to"),
     request: Request = None,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("files", "write")),
-    db: AsyncSession = Depends(get_db),
+    session: dict = Depends(get_session_or_404),
 ):
     """
     Upload file to session
     """
-    session = await sliver.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found",
-        )
+    max_size = settings.sliver_max_upload_mb * 1024 * 1024
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File exceeds {settings.sliver_max_upload_mb} MiB upload limit",
+    )
 
-    # Read file data from request body
-    body = await request.body()
+    # Reject from the declared size before reading anything
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit():
+        if int(content_length) == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No file data provided",
+            )
+        if int(content_length) > max_size:
+            raise too_large
+
+    # Sliver's upload RPC takes the whole file, so the body is buffered, but
+    # read incrementally so oversized streams are cut off early
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_size:
+            raise too_large
     if not body:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No file data provided",
         )
 
-    await sliver.session_upload(session_id, remote_path, body)
+    await sliver.session_upload(session_id, remote_path, bytes(body))
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="upload",
         resource="files",
         resource_id=session_id,
         details={"path": remote_path, "size": len(body)},
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return MessageResponse(message=f"File uploaded to {remote_path}")
 
@@ -502,40 +525,28 @@ async def upload_file(
 async def create_directory(
     session_id: str,
     path: str = Query(..., description="Directory path to create"),
-    request: Request = None,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("files", "write")),
-    db: AsyncSession = Depends(get_db),
+    session: dict = Depends(get_session_or_404),
 ):
     """
     Create directory on session
     """
-    session = await sliver.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found",
-        )
-
     # Execute mkdir command
-    os_type = session.get("os", "").lower()
-    if os_type == "windows":
-        command = f'mkdir "{path}"'
-    else:
-        command = f'mkdir -p "{path}"'
+    command = _shell_command(MKDIR_CMD, session, path=path)
 
     await sliver.session_shell(session_id, command)
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="mkdir",
         resource="files",
         resource_id=session_id,
         details={"path": path},
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return MessageResponse(message=f"Directory created: {path}")
 
@@ -544,78 +555,103 @@ async def create_directory(
 async def delete_file(
     session_id: str,
     path: str = Query(..., description="File/directory path to delete"),
-    request: Request = None,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("files", "delete")),
-    db: AsyncSession = Depends(get_db),
+    session: dict = Depends(get_session_or_404),
 ):
     """
     Delete file or directory on session
     """
-    session = await sliver.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found",
-        )
-
     # Execute delete command
-    os_type = session.get("os", "").lower()
-    if os_type == "windows":
-        command = f'del /F /Q "{path}" 2>nul || rmdir /S /Q "{path}"'
-    else:
-        command = f'rm -rf "{path}"'
+    command = _shell_command(DELETE_CMD, session, path=path)
 
     await sliver.session_shell(session_id, command)
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="delete",
         resource="files",
         resource_id=session_id,
         details={"path": path},
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return MessageResponse(message=f"Deleted: {path}")
 
 
+@router.post("/{session_id}/files/batch", response_model=ShellResponse)
+async def batch_file_operations(
+    session_id: str,
+    batch: FileBatchRequest,
+    ip_address: Optional[str] = Depends(get_client_ip),
+    sliver: SliverManager = Depends(get_sliver),
+    user: User = Depends(get_current_user),
+    session: dict = Depends(get_session_or_404),
+):
+    """
+    Run several kill/mkdir/delete operations in one shell round-trip
+    """
+    for resource, action in {_BATCH_OPS[o.op][2] for o in batch.operations}:
+        if not user.has_permission(resource, action):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Permission denied: {resource}.{action}",
+            )
+
+    commands = []
+    for operation in batch.operations:
+        templates, arg, _ = _BATCH_OPS[operation.op]
+        commands.append(
+            _shell_command(templates, session, **{arg: getattr(operation, arg)})
+        )
+    os_key = "windows" if session.get("os", "").lower() == "windows" else "posix"
+    result = await sliver.session_shell(session_id, _BATCH_SEPARATOR[os_key].join(commands))
+
+    # Audit log
+    audit_logger.log(
+        user_id=user.id,
+        action="batch",
+        resource="files",
+        resource_id=session_id,
+        details={
+            "ops": [o.model_dump(exclude_none=True) for o in batch.operations],
+        },
+        ip_address=ip_address,
+    )
+
+    return ShellResponse(
+        output=result.get("output", ""),
+        stderr=result.get("stderr"),
+        exit_code=result.get("exit_code", 0),
+        executed_at=datetime.now(timezone.utc),
+    )
+
+
 @router.get("/{session_id}/screenshot")
 async def take_screenshot(
     session_id: str,
-    request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("sessions", "read")),
-    db: AsyncSession = Depends(get_db),
+    session: dict = Depends(get_session_or_404),
 ):
     """
     Take screenshot from session
     """
-    session = await sliver.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found",
-        )
-
     data = await sliver.session_screenshot(session_id)
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="screenshot",
         resource="sessions",
         resource_id=session_id,
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
-    return StreamingResponse(
-        io.BytesIO(data),
-        media_type="image/png",
-    )
+    return _bytes_response(data, media_type="image/png")
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -639,21 +675,14 @@ class ExecuteAssemblyResponse(BaseModel):
 async def execute_assembly(
     session_id: str,
     request_data: ExecuteAssemblyRequest,
-    request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     sliver: SliverManager = Depends(get_sliver),
     user: User = Depends(require_permission("sessions", "execute")),
-    db: AsyncSession = Depends(get_db),
+    session: dict = Depends(get_session_or_404),
 ):
     """
     Execute .NET assembly on session
     """
-    session = await sliver.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found",
-        )
-
     result = await sliver.session_execute_assembly(
         session_id,
         request_data.assembly_path,
@@ -662,7 +691,7 @@ async def execute_assembly(
     )
 
     # Audit log
-    audit = AuditLog(
+    audit_logger.log(
         user_id=user.id,
         action="execute_assembly",
         resource="sessions",
@@ -672,9 +701,8 @@ async def execute_assembly(
             "arguments": request_data.arguments[:200],
             "hostname": session.get("hostname"),
         },
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     return ExecuteAssemblyResponse(
         output=result.get("output", ""),
@@ -2,24 +2,63 @@
 User management endpoints (Admin only)
 """
 
+import asyncio
 import logging
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import TypeAdapter
+from sqlalchemy import delete, exists, false, insert, select, true
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, raiseload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.api.deps import get_admin_user, get_db
+from app.api.deps import get_admin_user, get_client_ip, get_db, invalidate_auth_cache
+from app.core.responses import ORJSONResponse
 from app.core.security import get_password_hash
-from app.models import User, Role, AuditLog
+from app.models import User, Role
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserList, RoleResponse
 from app.schemas.common import MessageResponse
+from app.services.audit_fast import audit_insert
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Join the role in (many-to-one, so no row duplication and no second query);
+# touching any other relationship raises instead of silently issuing a lazy
+# query
+_user_load_options = (joinedload(User.role).raiseload("*"), raiseload("*"))
+
+# Built once; validating a whole list through one adapter avoids a
+# model_validate call per row
+_USERS_ADAPTER = TypeAdapter(List[UserResponse])
+_ROLES_ADAPTER = TypeAdapter(List[RoleResponse])
+
+
+def _user_checks(
+    username: Optional[str] = None,
+    email: Optional[str] = None,
+    exclude_id: Optional[int] = None,
+) -> list:
+    """
+    EXISTS columns for the create/update uniqueness checks, for one SELECT
+
+    username_taken / email_taken are false when the value isn't being set;
+    exclude_id skips the user being updated.
+    """
+    others = [User.id != exclude_id] if exclude_id is not None else []
+    return [
+        (
+            exists().where(User.username == username, *others)
+            if username else false()
+        ).label("username_taken"),
+        (
+            exists().where(User.email == email, *others)
+            if email else false()
+        ).label("email_taken"),
+    ]
+
 
 @router.get("", response_model=UserList)
 async def list_users(
@@ -30,14 +69,15 @@ async def list_users(
     List all users (Admin only)
     """
     result = await db.execute(
-        select(User).options(selectinload(User.role))
+        select(User).options(*_user_load_options)
     )
-    users = result.scalars().all()
+    users = _USERS_ADAPTER.validate_python(result.scalars().all(), from_attributes=True)
 
-    return UserList(
-        users=[UserResponse.model_validate(u) for u in users],
-        total=len(users),
-    )
+    # Already validated above; skip FastAPI's second pass over the response
+    return ORJSONResponse({
+        "users": _USERS_ADAPTER.dump_python(users),
+        "total": len(users),
+    })
 
 
 @router.get("/roles", response_model=List[RoleResponse])
@@ -49,82 +89,79 @@ async def list_roles(
     List available roles
     """
     result = await db.execute(select(Role))
-    roles = result.scalars().all()
-    return [RoleResponse.model_validate(r) for r in roles]
+    roles = _ROLES_ADAPTER.validate_python(result.scalars().all(), from_attributes=True)
+    return ORJSONResponse(_ROLES_ADAPTER.dump_python(roles))
 
 
 @router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(
     user_data: UserCreate,
-    request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     admin: User = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Create new user (Admin only)
     """
-    # Check if username exists
-    result = await db.execute(
-        select(User).where(User.username == user_data.username)
+    # Username/email uniqueness and the role, in one round-trip; the password
+    # is hashed in a thread meanwhile so bcrypt doesn't stall the event loop
+    checks = select(*_user_checks(
+        username=user_data.username,
+        email=user_data.email,
+    )).subquery()
+    result, password_hash = await asyncio.gather(
+        db.execute(
+            select(checks, Role).outerjoin(Role, Role.id == user_data.role_id)
+        ),
+        asyncio.to_thread(get_password_hash, user_data.password),
     )
-    if result.scalar_one_or_none():
+    row = result.one()
+    if row.username_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already exists",
         )
-
-    # Check if email exists
-    if user_data.email:
-        result = await db.execute(
-            select(User).where(User.email == user_data.email)
+    if row.email_taken:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already exists",
         )
-        if result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already exists",
-            )
-
-    # Verify role exists
-    result = await db.execute(select(Role).where(Role.id == user_data.role_id))
-    role = result.scalar_one_or_none()
-    if not role:
+    role = row.Role
+    if role is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid role ID",
         )
 
-    # Create user
-    new_user = User(
-        username=user_data.username,
-        email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
-        role_id=user_data.role_id,
-        is_active=True,
+    # Create user; RETURNING hands back the full row, and the role is already
+    # loaded, so no reload is needed after commit
+    result = await db.execute(
+        insert(User)
+        .values(
+            username=user_data.username,
+            email=user_data.email,
+            password_hash=password_hash,
+            role_id=role.id,
+            is_active=True,
+        )
+        .returning(User)
     )
-    db.add(new_user)
-    await db.flush()
+    new_user = result.scalar_one()
+    set_committed_value(new_user, "role", role)
 
     # Audit log
-    audit = AuditLog(
+    await audit_insert(
+        db,
         user_id=admin.id,
         action="create",
         resource="users",
         resource_id=str(new_user.id),
         details={"username": user_data.username, "role": role.name},
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     await db.commit()
 
-    # Reload with role
-    result = await db.execute(
-        select(User)
-        .options(selectinload(User.role))
-        .where(User.id == new_user.id)
-    )
-    new_user = result.scalar_one()
-
     logger.info(f"User created: {user_data.username} by {admin.username}")
     return UserResponse.model_validate(new_user)
 
@@ -140,7 +177,7 @@ async def get_user(
     """
     result = await db.execute(
         select(User)
-        .options(selectinload(User.role))
+        .options(*_user_load_options)
         .where(User.id == user_id)
     )
     user = result.scalar_one_or_none()
@@ -158,25 +195,41 @@ async def get_user(
 async def update_user(
     user_id: int,
     user_data: UserUpdate,
-    request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     admin: User = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Update user (Admin only)
     """
+    update_data = user_data.model_dump(exclude_unset=True)
+
+    # Load the user together with the uniqueness/role checks for the fields
+    # being changed, in one round-trip
     result = await db.execute(
-        select(User)
-        .options(selectinload(User.role))
+        select(
+            User,
+            *_user_checks(
+                username=update_data.get("username"),
+                email=update_data.get("email"),
+                exclude_id=user_id,
+            ),
+            (
+                exists().where(Role.id == update_data["role_id"])
+                if "role_id" in update_data else true()
+            ).label("role_exists"),
+        )
+        .options(*_user_load_options)
         .where(User.id == user_id)
     )
-    user = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not user:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
+    user = row.User
 
     # Prevent admin from deactivating themselves
     if user.id == admin.id and user_data.is_active is False:
@@ -185,75 +238,58 @@ async def update_user(
             detail="Cannot deactivate your own account",
         )
 
-    # Update fields
-    update_data = user_data.model_dump(exclude_unset=True)
+    if row.username_taken:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already exists",
+        )
+    if row.email_taken:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already exists",
+        )
+    if not row.role_exists:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid role ID",
+        )
 
+    # Update fields
     if "username" in update_data:
-        # Check uniqueness
-        result = await db.execute(
-            select(User).where(
-                User.username == update_data["username"],
-                User.id != user_id,
-            )
-        )
-        if result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username already exists",
-            )
         user.username = update_data["username"]
 
     if "email" in update_data and update_data["email"]:
-        result = await db.execute(
-            select(User).where(
-                User.email == update_data["email"],
-                User.id != user_id,
-            )
-        )
-        if result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already exists",
-            )
         user.email = update_data["email"]
 
     if "password" in update_data:
-        user.password_hash = get_password_hash(update_data["password"])
+        user.password_hash = await asyncio.to_thread(
+            get_password_hash, update_data["password"]
+        )
 
     if "role_id" in update_data:
-        result = await db.execute(
-            select(Role).where(Role.id == update_data["role_id"])
-        )
-        if not result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid role ID",
-            )
         user.role_id = update_data["role_id"]
 
     if "is_active" in update_data:
         user.is_active = update_data["is_active"]
 
     # Audit log
-    audit = AuditLog(
+    await audit_insert(
+        db,
         user_id=admin.id,
         action="update",
         resource="users",
         resource_id=str(user_id),
         details={"updated_fields": list(update_data.keys())},
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
     await db.commit()
+    invalidate_auth_cache(user_id)
 
-    # Reload
-    result = await db.execute(
-        select(User)
-        .options(selectinload(User.role))
-        .where(User.id == user_id)
-    )
-    user = result.scalar_one()
+    # The instance is still current (no expire on commit); only a role change
+    # leaves a stale relationship behind
+    if "role_id" in update_data:
+        await db.refresh(user, ["role"])
 
     return UserResponse.model_validate(user)
 
@@ -261,7 +297,7 @@ async def update_user(
 @router.delete("/{user_id}", response_model=MessageResponse)
 async def delete_user(
     user_id: int,
-    request: Request,
+    ip_address: Optional[str] = Depends(get_client_ip),
     admin: User = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -274,30 +310,30 @@ async def delete_user(
             detail="Cannot delete your own account",
         )
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    result = await db.execute(
+        delete(User).where(User.id == user_id).returning(User.username)
+    )
+    username = result.scalar_one_or_none()
 
-    if not user:
+    if username is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
 
-    username = user.username
-
-    # Audit log before delete
-    audit = AuditLog(
+    # Audit log, committed together with the delete
+    await audit_insert(
+        db,
         user_id=admin.id,
         action="delete",
         resource="users",
         resource_id=str(user_id),
         details={"deleted_username": username},
-        ip_address=request.client.host if request.client else None,
+        ip_address=ip_address,
     )
-    db.add(audit)
 
-    await db.delete(user)
     await db.commit()
+    invalidate_auth_cache(user_id)
 
     logger.info(f"User deleted: {username} by {admin.username}")
     return MessageResponse(message=f"User {username} deleted")
@@ -3,10 +3,13 @@ WebSocket endpoint for real-time updates
 """
 
 import asyncio
-import json
+import contextlib
+import itertools
 import logging
-from typing import Set, Dict, Any
+from dataclasses import dataclass
+from typing import Any, Dict, Set
 
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 from app.core.security import verify_token
 from app.services.sliver_client import sliver_manager
@@ -16,117 +19,222 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+# Messages buffered per client before it is treated as too slow and dropped
+OUTBOUND_QUEUE_SIZE = 256
+
+# Connection numbers for client ids; unlike id(websocket) they are never reused
+_connection_ids = itertools.count(1)
+
+
+def _encode(message: Dict[str, Any]) -> str:
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+@dataclass
+class _Client:
+    """A connected WebSocket with its outbound queue and writer task"""
+
+    websocket: WebSocket
+    queue: asyncio.Queue
+    writer: asyncio.Task
+
+
 class ConnectionManager:
-    """Manage WebSocket connections"""
+    """
+    Manage WebSocket connections
+
+    Every client has a bounded outbound queue drained by its own writer task,
+    so sending never waits on a socket and needs no lock. A client that falls
+    a full queue behind is closed (1013, try again later) and resyncs when it
+    reconnects.
+    """
 
     def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
-        self._lock = asyncio.Lock()
+        self.active_connections: Dict[str, _Client] = {}
 
     async def connect(self, websocket: WebSocket, client_id: str) -> None:
         await websocket.accept()
-        async with self._lock:
-            self.active_connections[client_id] = websocket
+        queue: asyncio.Queue = asyncio.Queue(maxsize=OUTBOUND_QUEUE_SIZE)
+        writer = asyncio.create_task(self._writer(client_id, websocket, queue))
+        previous = self.active_connections.get(client_id)
+        self.active_connections[client_id] = _Client(websocket, queue, writer)
+        if previous is not None:
+            previous.writer.cancel()
         logger.info(f"WebSocket connected: {client_id}")
 
     async def disconnect(self, client_id: str) -> None:
-        async with self._lock:
-            if client_id in self.active_connections:
-                del self.active_connections[client_id]
+        client = self.active_connections.pop(client_id, None)
+        if client is not None:
+            client.writer.cancel()
         logger.info(f"WebSocket disconnected: {client_id}")
 
     async def broadcast(self, message: Dict[str, Any]) -> None:
         """Broadcast message to all connected clients"""
-        async with self._lock:
-            disconnected = []
-            for client_id, connection in self.active_connections.items():
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.error(f"Error sending to {client_id}: {e}")
-                    disconnected.append(client_id)
-
-            for client_id in disconnected:
-                del self.active_connections[client_id]
+        payload = _encode(message)
+        for client_id, client in list(self.active_connections.items()):
+            self._enqueue(client_id, client, payload)
 
     async def send_personal(self, client_id: str, message: Dict[str, Any]) -> None:
         """Send message to specific client"""
-        async with self._lock:
-            if client_id in self.active_connections:
-                try:
-                    await self.active_connections[client_id].send_json(message)
-                except Exception as e:
-                    logger.error(f"Error sending to {client_id}: {e}")
+        client = self.active_connections.get(client_id)
+        if client is not None:
+            self._enqueue(client_id, client, _encode(message))
+
+    def _enqueue(self, client_id: str, client: _Client, payload: str) -> None:
+        try:
+            client.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            logger.warning(f"WebSocket client {client_id} too slow, disconnecting")
+            self._drop(client_id, client)
+
+    def _drop(self, client_id: str, client: _Client) -> None:
+        # Only unregister it if the client hasn't reconnected meanwhile
+        if self.active_connections.get(client_id) is client:
+            del self.active_connections[client_id]
+        client.writer.cancel()
+
+    async def _writer(self, client_id: str, websocket: WebSocket, queue: asyncio.Queue) -> None:
+        try:
+            while True:
+                await websocket.send_text(await queue.get())
+        except asyncio.CancelledError:
+            # Disconnected or dropped as too slow; make sure the socket closes
+            with contextlib.suppress(Exception):
+                await websocket.close(code=1013)
+            raise
+        except Exception as e:
+            logger.error(f"Error sending to {client_id}: {e}")
+            client = self.active_connections.get(client_id)
+            if client is not None and client.writer is asyncio.current_task():
+                del self.active_connections[client_id]
 
 
 manager = ConnectionManager()
 
 
-async def sync_sliver_events():
+# Sliver event -> list it is reported under in a delta frame
+_DELTA_KEYS = {
+    "session.new": "sessions_new",
+    "session.lost": "sessions_lost",
+    "beacon.new": "beacons_new",
+}
+
+# Pause before re-subscribing after the event stream ends or Sliver is down
+EVENT_RETRY_SECONDS = 5
+# Undelivered events kept before new ones are dropped; the next
+# reconciliation picks up whatever was dropped
+EVENT_QUEUE_SIZE = 1024
+# How often the full session/beacon listings are diffed against what clients
+# were told, also done on every (re)subscribe
+RECONCILE_SECONDS = 60
+
+
+class _SliverEventPump:
     """
-    Background task to sync Sliver events and broadcast to clients
+    Feeds Sliver's event stream into a queue, re-subscribing if it drops
 
-    This would ideally use Sliver's event stream, but for now we poll.
+    Events emitted while the stream is down are never replayed, so every
+    (re)subscribe and every RECONCILE_SECONDS the current listings are
+    diffed against the sessions and beacons already reported, and the
+    difference is sent as ordinary events.
     """
-    previous_sessions = set()
-    previous_beacons = set()
 
-    while True:
-        try:
-            if sliver_manager.is_connected:
-                # Check for new/lost sessions
-                current_sessions = set()
-                sessions = await sliver_manager.get_sessions()
-                for session in sessions:
-                    current_sessions.add(session["id"])
-
-                # New sessions
-                new_sessions = current_sessions - previous_sessions
-                for session_id in new_sessions:
-                    session = next(
-                        (s for s in sessions if s["id"] == session_id), None
-                    )
-                    if session:
-                        await manager.broadcast({
-                            "event": "session.new",
-                            "data": session,
-                        })
-
-                # Lost sessions
-                lost_sessions = previous_sessions - current_sessions
-                for session_id in lost_sessions:
-                    await manager.broadcast({
-                        "event": "session.lost",
-                        "data": {"id": session_id},
-                    })
+    def __init__(self, queue: asyncio.Queue):
+        self._queue = queue
+        self._sessions: Set[str] = set()
+        self._beacons: Set[str] = set()
+        self._seeded = False
 
-                previous_sessions = current_sessions
+    async def run(self) -> None:
+        while True:
+            if sliver_manager.is_connected:
+                reconciler = asyncio.create_task(self._reconcile_periodically())
+                try:
+                    async for event, data in sliver_manager.event_stream():
+                        self._emit(event, data)
+                except Exception as e:
+                    logger.error(f"Sliver event stream failed: {e}")
+                finally:
+                    reconciler.cancel()
+            await asyncio.sleep(EVENT_RETRY_SECONDS)
 
-                # Check for beacons
-                current_beacons = set()
-                beacons = await sliver_manager.get_beacons()
-                for beacon in beacons:
-                    current_beacons.add(beacon["id"])
+    def _emit(self, event: str, data: dict) -> None:
+        try:
+            self._queue.put_nowait((event, data))
+        except asyncio.QueueFull:
+            # Not recorded as reported, so the next reconciliation resends it
+            logger.warning(f"Sliver event queue full, dropping {event}")
+            return
+
+        if event == "session.new":
+            self._sessions.add(data["id"])
+        elif event == "session.lost":
+            self._sessions.discard(data["id"])
+        elif event == "beacon.new":
+            self._beacons.add(data["id"])
+
+    async def _reconcile_periodically(self) -> None:
+        while True:
+            try:
+                await self._reconcile()
+            except Exception as e:
+                logger.error(f"Sliver reconciliation failed: {e}")
+            await asyncio.sleep(RECONCILE_SECONDS)
+
+    async def _reconcile(self) -> None:
+        sessions_before = set(self._sessions)
+        beacons_before = set(self._beacons)
+        sessions, beacons = await asyncio.gather(
+            sliver_manager.get_sessions(),
+            sliver_manager.get_beacons(),
+        )
+        # Leave ids the stream reported on while the listings were fetched
+        skip_sessions = sessions_before ^ self._sessions
+        skip_beacons = beacons_before ^ self._beacons
+        session_ids = {s["id"] for s in sessions} - skip_sessions
+        beacon_ids = {b["id"] for b in beacons} - skip_beacons
+
+        if not self._seeded:
+            # Clients load the initial listings themselves; only relay changes
+            self._sessions |= session_ids
+            self._beacons |= beacon_ids
+            self._seeded = True
+            return
+
+        for session in sessions:
+            if session["id"] in session_ids and session["id"] not in self._sessions:
+                self._emit("session.new", session)
+        for session_id in self._sessions - session_ids - skip_sessions:
+            self._emit("session.lost", {"id": session_id})
+        for beacon in beacons:
+            if beacon["id"] in beacon_ids and beacon["id"] not in self._beacons:
+                self._emit("beacon.new", beacon)
+        # There is no beacon-removed event for clients; just forget them
+        self._beacons -= self._beacons - beacon_ids - skip_beacons
 
-                # New beacons
-                new_beacons = current_beacons - previous_beacons
-                for beacon_id in new_beacons:
-                    beacon = next(
-                        (b for b in beacons if b["id"] == beacon_id), None
-                    )
-                    if beacon:
-                        await manager.broadcast({
-                            "event": "beacon.new",
-                            "data": beacon,
-                        })
 
-                previous_beacons = current_beacons
+async def sync_sliver_events():
+    """
+    Background task to relay Sliver events to clients
 
-        except Exception as e:
-            logger.error(f"Error in sync task: {e}")
+    Events are pushed from Sliver's event stream as they happen; any that
+    arrive while a frame is being broadcast are coalesced into the next
+    delta frame.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+    pump = asyncio.create_task(_SliverEventPump(queue).run())
+    try:
+        while True:
+            events = [await queue.get()]
+            while not queue.empty():
+                events.append(queue.get_nowait())
 
-        # Poll every 5 seconds
-        await asyncio.sleep(5)
+            delta: Dict[str, list] = {key: [] for key in _DELTA_KEYS.values()}
+            for event, data in events:
+                delta[_DELTA_KEYS[event]].append(data)
+            await manager.broadcast({"event": "delta", "data": delta})
+    finally:
+        pump.cancel()
 
 
 @router.websocket("/ws")
@@ -150,13 +258,13 @@ async def websocket_endpoint(
         return
 
     user_id = payload.get("sub")
-    client_id = f"user_{user_id}_{id(websocket)}"
+    client_id = f"user_{user_id}_{next(_connection_ids)}"
 
     await manager.connect(websocket, client_id)
 
     try:
         # Send initial state
-        await websocket.send_json({
+        await manager.send_personal(client_id, {
             "event": "connected",
             "data": {
                 "client_id": client_id,
@@ -164,34 +272,29 @@ async def websocket_endpoint(
             },
         })
 
-        # Keep connection alive and handle client messages
+        # Handle client messages. Keepalive is left to the server's protocol
+        # level ping/pong (uvicorn's --ws-ping-interval/--ws-ping-timeout,
+        # 20s each by default), which also drops dead peers.
         while True:
             try:
-                data = await asyncio.wait_for(
-                    websocket.receive_text(),
-                    timeout=30.0,
-                )
+                data = await websocket.receive_text()
 
-                message = json.loads(data)
+                message = orjson.loads(data)
                 event_type = message.get("type")
 
                 if event_type == "ping":
-                    await websocket.send_json({"event": "pong"})
+                    await manager.send_personal(client_id, {"event": "pong"})
 
                 elif event_type == "subscribe":
                     # Handle subscription requests
                     channels = message.get("channels", [])
-                    await websocket.send_json({
+                    await manager.send_personal(client_id, {
                         "event": "subscribed",
                         "data": {"channels": channels},
                     })
 
-            except asyncio.TimeoutError:
-                # Send ping to keep alive
-                await websocket.send_json({"event": "ping"})
-
-            except json.JSONDecodeError:
-                await websocket.send_json({
+            except orjson.JSONDecodeError:
+                await manager.send_personal(client_id, {
                     "event": "error",
                     "data": {"message": "Invalid JSON"},
                 })
@@ -28,14 +28,32 @@ class Settings(BaseSettings):
     jwt_expire_minutes: int = 60
     jwt_refresh_expire_days: int = 7
 
+    # In-process cache of verified tokens (keep well below jwt_expire_minutes)
+    auth_cache_ttl_seconds: int = 30
+    auth_cache_size: int = 4096
+
     # Database
     database_url: str = "sqlite:///./data/sliverui.db"
+    db_pool_size: int = 20  # ignored for SQLite
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: int = 10  # wait for a free connection before erroring
+    db_pool_recycle_seconds: int = 1800  # replace connections older than this
 
     # Redis
+    # Empty: single worker, in-process caches and implant builds
     redis_url: str = "redis://localhost:6379/0"
+    implant_cache_ttl_seconds: int = 3600  # generated implants kept for download
+    implant_cache_max: int = 64  # in-process store only; Redis uses maxmemory
+    implant_md5: bool = False  # also report MD5 alongside SHA-256
+    tag_cache_ttl_seconds: int = 300  # cached tag listings
 
     # Sliver
     sliver_config: Optional[str] = None
+    sliver_cache_ttl_seconds: int = 3  # memoized session/beacon/job listings
+    sliver_max_concurrent_rpcs: int = 32  # per worker process
+    sliver_max_concurrent_long_rpcs: int = 8  # shells, transfers, builds; separate from the above
+    sliver_client_pool_size: int = 1  # gRPC connections per worker process
+    sliver_max_upload_mb: int = 256  # uploads are buffered whole for the unary RPC
 
     # GitHub token for armory operations (increases rate limit from 60 to 5000/hour)
     github_token: Optional[str] = None
@@ -45,11 +63,15 @@ class Settings(BaseSettings):
 
     # Rate Limiting
     rate_limit_per_minute: int = 100
+    login_rate_limit_per_minute: int = 10  # per username + client IP
 
     # Logging
     log_level: str = "INFO"
     log_file: Optional[str] = None
 
+    # Profiling (admin-only ?profile=1 requests; needs pyinstrument)
+    profiling: bool = False
+
     @property
     def is_development(self) -> bool:
         return self.app_env == "development"
@@ -59,6 +81,26 @@ class Settings(BaseSettings):
         return self.app_env == "production"
 
 
+class TokenHolder:
+    """
+    Holder for a runtime-mutable secret
+
+    Assignment of a single attribute is atomic, so readers never see a
+    partially updated value and the Settings singleton stays untouched.
+    """
+
+    __slots__ = ("_value",)
+
+    def __init__(self, value: Optional[str] = None):
+        self._value = value
+
+    def get(self) -> Optional[str]:
+        return self._value
+
+    def set(self, value: Optional[str]) -> None:
+        self._value = value
+
+
 @lru_cache()
 def get_settings() -> Settings:
     """Get cached settings instance"""
@@ -66,3 +108,6 @@ def get_settings() -> Settings:
 
 
 settings = get_settings()
+
+# GitHub token for armory operations; can be replaced at runtime via the API
+github_token_holder = TokenHolder(settings.github_token)
@@ -54,3 +54,9 @@ class RateLimitError(SliverUIException):
     """Rate limit exceeded"""
 
     pass
+
+
+class WriteBacklogError(SliverUIException):
+    """Background write queue is full"""
+
+    pass
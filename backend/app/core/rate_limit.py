@@ -0,0 +1,37 @@
+"""
+In-process rate limiting
+"""
+
+import time
+from typing import Hashable
+
+from cachetools import TTLCache
+
+from .exceptions import RateLimitError
+
+
+class RateLimiter:
+    """
+    Fixed-window rate limiter keyed by an arbitrary hashable
+
+    State is per process, so with several workers the effective limit is
+    multiplied by the worker count.
+    """
+
+    def __init__(self, limit: int, window: float = 60.0, maxsize: int = 10000):
+        self.limit = limit
+        self.window = window
+        # key -> (window start, hits in window)
+        self._hits: TTLCache = TTLCache(maxsize=maxsize, ttl=window)
+
+    def hit(self, key: Hashable) -> None:
+        """Record a hit, raising RateLimitError once the limit is exceeded"""
+        now = time.monotonic()
+        start, count = self._hits.get(key, (now, 0))
+        if now - start >= self.window:
+            start, count = now, 0
+        if count >= self.limit:
+            raise RateLimitError(
+                f"Too many attempts, retry in {int(self.window - (now - start)) + 1}s"
+            )
+        self._hits[key] = (start, count + 1)
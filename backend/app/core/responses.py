@@ -0,0 +1,21 @@
+"""
+Response classes
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson
+
+    For endpoints that return plain dicts/lists without a response_model.
+    Endpoints with a response_model are already serialized by pydantic-core,
+    so this class should not be set as the app-wide default.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
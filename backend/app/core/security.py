@@ -2,26 +2,48 @@
 Security utilities - JWT, password hashing, etc.
 """
 
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import bcrypt
+import jwt
+from cachetools import TTLCache
+from jwt import InvalidTokenError
 
 from .config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt cost factor (passlib's default, so existing hashes are unchanged)
+BCRYPT_ROUNDS = 12
+# bcrypt only uses the first 72 bytes of a password
+_BCRYPT_MAX_BYTES = 72
+
+# Signing settings are fixed for the life of the process; bind them once
+# instead of looking them up on every token
+_SECRET_KEY = settings.secret_key
+_JWT_ALGORITHM = settings.jwt_algorithm
+
+# token -> verified claims. Only the signature check is cached: exp and the
+# token type are re-checked on every hit.
+_verified_tokens: TTLCache = TTLCache(maxsize=10_000, ttl=30)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return bcrypt.checkpw(
+            plain_password.encode()[:_BCRYPT_MAX_BYTES], hashed_password.encode()
+        )
+    except ValueError:
+        # Malformed hash
+        return False
 
 
 def get_password_hash(password: str) -> str:
     """Generate password hash"""
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(
+        password.encode()[:_BCRYPT_MAX_BYTES], bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    ).decode()
 
 
 def create_access_token(
@@ -47,9 +69,7 @@ def create_access_token(
     if additional_claims:
         to_encode.update(additional_claims)
 
-    encoded_jwt = jwt.encode(
-        to_encode, settings.secret_key, algorithm=settings.jwt_algorithm
-    )
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY, algorithm=_JWT_ALGORITHM)
     return encoded_jwt
 
 
@@ -66,36 +86,38 @@ def create_refresh_token(subject: str | Any) -> str:
         "type": "refresh",
     }
 
-    encoded_jwt = jwt.encode(
-        to_encode, settings.secret_key, algorithm=settings.jwt_algorithm
-    )
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY, algorithm=_JWT_ALGORITHM)
     return encoded_jwt
 
 
 def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
     """Verify and decode JWT token"""
-    try:
-        payload = jwt.decode(
-            token, settings.secret_key, algorithms=[settings.jwt_algorithm]
-        )
-
-        # Check token type
-        if payload.get("type") != token_type:
+    payload = _verified_tokens.get(token)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, _SECRET_KEY, algorithms=[_JWT_ALGORITHM])
+        except InvalidTokenError:
             return None
+        _verified_tokens[token] = payload
+    elif "exp" in payload and payload["exp"] <= time.time():
+        del _verified_tokens[token]
+        return None
 
-        return payload
-    except JWTError:
+    # Check token type
+    if payload.get("type") != token_type:
         return None
 
+    return payload
+
 
 def decode_token(token: str) -> Optional[dict]:
     """Decode JWT token without verification (for debugging)"""
     try:
         return jwt.decode(
             token,
-            settings.secret_key,
-            algorithms=[settings.jwt_algorithm],
+            _SECRET_KEY,
+            algorithms=[_JWT_ALGORITHM],
             options={"verify_exp": False},
         )
-    except JWTError:
+    except InvalidTokenError:
         return None
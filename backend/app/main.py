@@ -2,12 +2,14 @@
 SliverUI - Main FastAPI Application
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES, GZipMiddleware
 from fastapi.responses import JSONResponse
 
 from app import __version__
@@ -18,10 +20,14 @@ from app.core.exceptions import (
     AuthorizationError,
     NotFoundError,
     RateLimitError,
+    WriteBacklogError,
 )
 from app.api.v1 import api_router
-from app.api.websocket import websocket_router
+from app.api.middleware import JWTAuthMiddleware, ProfilerMiddleware, PYINSTRUMENT_AVAILABLE
+from app.api.websocket import sync_sliver_events, websocket_router
 from app.services.database import init_db, close_db
+from app.services.batch_writer import audit_logger, history_writer
+from app.services.redis_client import close_redis
 from app.services.sliver_client import sliver_manager
 
 # Configure logging
@@ -42,6 +48,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     await init_db()
     logger.info("Database initialized")
 
+    # Start background audit log and command history writers
+    audit_logger.start()
+    history_writer.start()
+
     # Connect to Sliver (if config provided)
     if settings.sliver_config:
         try:
@@ -50,14 +60,26 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
         except Exception as e:
             logger.warning(f"Failed to connect to Sliver: {e}")
 
+    # Relay Sliver session/beacon events to WebSocket clients
+    events_task = asyncio.create_task(sync_sliver_events())
+
     yield
 
     # Shutdown
     logger.info("Shutting down...")
 
+    events_task.cancel()
+
     # Disconnect from Sliver
     await sliver_manager.disconnect()
 
+    # Flush pending audit logs and command history
+    await audit_logger.stop()
+    await history_writer.stop()
+
+    # Close Redis connections
+    await close_redis()
+
     # Close database
     await close_db()
 
@@ -73,6 +95,24 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Profiler middleware (inside auth, which resolves the requesting user)
+if settings.profiling:
+    if PYINSTRUMENT_AVAILABLE:
+        app.add_middleware(ProfilerMiddleware)
+    else:
+        logger.warning("Profiling enabled but pyinstrument is not installed")
+
+# Compress larger responses (e.g. /export) when served without nginx in front.
+# Implants and downloaded files are streamed as-is.
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=1024,
+    exclude_content_types=DEFAULT_EXCLUDED_CONTENT_TYPES + ("application/octet-stream",),
+)
+
+# Auth middleware (added before CORS so preflight requests skip it)
+app.add_middleware(JWTAuthMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -116,6 +156,14 @@ async def rate_limit_error_handler(request: Request, exc: RateLimitError):
     )
 
 
+@app.exception_handler(WriteBacklogError)
+async def write_backlog_error_handler(request: Request, exc: WriteBacklogError):
+    return JSONResponse(
+        status_code=503,
+        content={"error": "Service unavailable", "detail": exc.message},
+    )
+
+
 @app.exception_handler(SliverUIException)
 async def sliverui_error_handler(request: Request, exc: SliverUIException):
     return JSONResponse(
@@ -2,11 +2,16 @@
 SQLAlchemy Base and common model utilities
 """
 
+import base64
+import zlib
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Optional
 
-from sqlalchemy import DateTime, func
+from sqlalchemy import DateTime, Text, func
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.types import TypeDecorator
 
 
 class Base(DeclarativeBase):
@@ -34,3 +39,68 @@ class TimestampMixin:
 def utc_now() -> datetime:
     """Get current UTC datetime"""
     return datetime.now(timezone.utc)
+
+
+class utc_timestamp(FunctionElement):
+    """
+    Current UTC time, evaluated by the database
+
+    Renders per dialect so naive DateTime columns get UTC regardless of the
+    server's time zone setting.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utc_timestamp)
+def _default_utc_timestamp(element, compiler, **kw) -> str:
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utc_timestamp, "postgresql")
+def _pg_utc_timestamp(element, compiler, **kw) -> str:
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utc_timestamp, "sqlite")
+def _sqlite_utc_timestamp(element, compiler, **kw) -> str:
+    # CURRENT_TIMESTAMP is UTC on SQLite but only has second precision
+    return "STRFTIME('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text stored zlib-compressed once it reaches min_size bytes
+
+    The column stays TEXT on every backend. Compressed values are stored as
+    MARKER + base64 of the zlib data; anything else is the plain string, so
+    rows written before the column was compressed read back unchanged. Plain
+    values that happen to start with MARKER are compressed regardless of
+    size to keep the two apart.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    MARKER = "\x01z:"
+
+    def __init__(self, min_size: int = 1024, level: int = 6):
+        super().__init__()
+        self.min_size = min_size
+        self.level = level
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[str]:
+        if value is None:
+            return None
+        data = value.encode()
+        if len(data) < self.min_size and not value.startswith(self.MARKER):
+            return value
+        return self.MARKER + base64.b64encode(zlib.compress(data, self.level)).decode("ascii")
+
+    def process_result_value(self, value: Optional[str], dialect) -> Optional[str]:
+        if value is None:
+            return None
+        if value.startswith(self.MARKER):
+            return zlib.decompress(base64.b64decode(value[len(self.MARKER):])).decode()
+        return value
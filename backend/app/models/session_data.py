@@ -3,10 +3,10 @@ Session notes and tags models
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Table
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, Table
+from sqlalchemy.orm import backref, relationship
 
-from app.models.base import Base
+from app.models.base import Base, CompressedText, utc_timestamp
 
 
 # Many-to-many relationship table for session tags
@@ -23,15 +23,20 @@ class SessionNote(Base):
     __tablename__ = 'session_notes'
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(String(64), index=True, nullable=False)  # Sliver session/beacon ID
+    session_id = Column(String(64), nullable=False)  # Sliver session/beacon ID
     session_type = Column(String(16), default='session')  # 'session' or 'beacon'
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=utc_timestamp())
 
-    # Relationships
-    user = relationship('User', backref='session_notes')
+    # Relationships (eager-load explicitly; lazy loads can't run under asyncio)
+    user = relationship('User', backref='session_notes', lazy='raise')
+
+    @property
+    def username(self) -> str:
+        """Author's username (requires user to be eager-loaded)"""
+        return self.user.username if self.user else 'Unknown'
 
 
 class Tag(Base):
@@ -50,13 +55,13 @@ class SessionTag(Base):
     __tablename__ = 'session_tag_associations'
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(String(64), index=True, nullable=False)
+    session_id = Column(String(64), nullable=False)
     session_type = Column(String(16), default='session')
-    tag_id = Column(Integer, ForeignKey('tags.id'), nullable=False)
+    tag_id = Column(Integer, ForeignKey('tags.id', ondelete='CASCADE'), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    # Relationships
-    tag = relationship('Tag', backref='session_associations')
+    # Relationships (the database removes associations when a tag is deleted)
+    tag = relationship('Tag', backref=backref('session_associations', passive_deletes=True))
 
 
 class CommandHistory(Base):
@@ -64,13 +69,33 @@ class CommandHistory(Base):
     __tablename__ = 'command_history'
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(String(64), index=True, nullable=False)
+    session_id = Column(String(64), nullable=False)
     session_type = Column(String(16), default='session')
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     command = Column(Text, nullable=False)
-    output = Column(Text)
+    output = Column(CompressedText())  # shell output is large and compresses well
     exit_code = Column(Integer)
     executed_at = Column(DateTime, default=datetime.utcnow)
 
-    # Relationships
-    user = relationship('User', backref='command_history')
+    # Relationships (eager-load explicitly; lazy loads can't run under asyncio)
+    user = relationship('User', backref='command_history', lazy='raise')
+
+    @property
+    def username(self) -> str:
+        """Username that ran the command (requires user to be eager-loaded)"""
+        return self.user.username if self.user else 'Unknown'
+
+
+# Composite indexes matching the per-session listing queries; session_id
+# leads each one, so they also serve plain session_id lookups
+Index(
+    'ix_session_notes_session_type_created',
+    SessionNote.session_id, SessionNote.session_type, SessionNote.created_at.desc(),
+)
+# Also lets add_tag_to_session insert with ON CONFLICT DO NOTHING
+Index(
+    'uq_session_tag_associations_session_tag',
+    SessionTag.session_id, SessionTag.session_type, SessionTag.tag_id,
+    unique=True,
+)
+Index('ix_command_history_session_executed', CommandHistory.session_id, CommandHistory.executed_at.desc())
@@ -19,6 +19,8 @@ from .session import (
     SessionInfo,
     ShellRequest,
     ShellResponse,
+    FileBatchOperation,
+    FileBatchRequest,
     ExecuteRequest,
     ExecuteResponse,
 )
@@ -27,10 +29,14 @@ from .beacon import (
     BeaconList,
     BeaconTaskRequest,
     BeaconTaskResponse,
+    ShellTaskRequest,
+    DownloadTaskRequest,
 )
 from .implant import (
     ImplantGenerateRequest,
     ImplantResponse,
+    ImplantJobAccepted,
+    ImplantJobResponse,
     ImplantList,
     ImplantProfile,
 )
@@ -66,6 +72,8 @@ __all__ = [
     "SessionInfo",
     "ShellRequest",
     "ShellResponse",
+    "FileBatchOperation",
+    "FileBatchRequest",
     "ExecuteRequest",
     "ExecuteResponse",
     # Beacon
@@ -73,9 +81,13 @@ __all__ = [
     "BeaconList",
     "BeaconTaskRequest",
     "BeaconTaskResponse",
+    "ShellTaskRequest",
+    "DownloadTaskRequest",
     # Implant
     "ImplantGenerateRequest",
     "ImplantResponse",
+    "ImplantJobAccepted",
+    "ImplantJobResponse",
     "ImplantList",
     "ImplantProfile",
     # Listener
@@ -55,6 +55,18 @@ class BeaconTaskRequest(BaseModel):
     timeout: int = Field(default=60, ge=1, le=3600)
 
 
+class ShellTaskRequest(BaseModel):
+    """Request to queue a shell command on a beacon"""
+
+    command: str = Field(..., min_length=1, description="Shell command")
+
+
+class DownloadTaskRequest(BaseModel):
+    """Request to queue a file download on a beacon"""
+
+    remote_path: str = Field(..., min_length=1, description="Remote file path")
+
+
 class BeaconTaskResponse(BaseModel):
     """Beacon task response"""
 
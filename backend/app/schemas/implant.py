@@ -65,12 +65,28 @@ class ImplantResponse(BaseModel):
     arch: str
     format: str
     size: int = Field(..., description="File size in bytes")
-    md5: str
+    md5: Optional[str] = Field(None, description="Only set when IMPLANT_MD5 is enabled")
     sha256: str
     generated_at: datetime
     download_url: str
 
 
+class ImplantJobAccepted(BaseModel):
+    """Queued implant generation job"""
+
+    job_id: str
+    status_url: str
+
+
+class ImplantJobResponse(BaseModel):
+    """Implant generation job status"""
+
+    job_id: str
+    state: str = Field(..., description="queued, running, done or error")
+    error: Optional[str] = None
+    implant: Optional[ImplantResponse] = Field(None, description="Set once state is done")
+
+
 class ImplantList(BaseModel):
     """List of implants"""
 
@@ -3,9 +3,9 @@ Session schemas for Sliver sessions
 """
 
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class SessionResponse(BaseModel):
@@ -62,6 +62,28 @@ class ShellResponse(BaseModel):
     executed_at: datetime
 
 
+class FileBatchOperation(BaseModel):
+    """One kill/mkdir/delete step of a batched request"""
+
+    op: Literal["kill", "mkdir", "delete"]
+    path: Optional[str] = Field(None, min_length=1, description="Target path (mkdir/delete)")
+    pid: Optional[int] = Field(None, ge=1, description="Process ID (kill)")
+
+    @model_validator(mode="after")
+    def check_target(self) -> "FileBatchOperation":
+        if self.op == "kill" and self.pid is None:
+            raise ValueError("kill requires pid")
+        if self.op != "kill" and self.path is None:
+            raise ValueError(f"{self.op} requires path")
+        return self
+
+
+class FileBatchRequest(BaseModel):
+    """Several kill/mkdir/delete operations run as one shell command"""
+
+    operations: List[FileBatchOperation] = Field(..., min_length=1, max_length=100)
+
+
 class ExecuteRequest(BaseModel):
     """Execute binary request"""
 
@@ -2,6 +2,7 @@
 
 from .database import get_db, init_db, close_db
 from .sliver_client import sliver_manager, get_sliver_client
+from .batch_writer import audit_logger
 
 __all__ = [
     "get_db",
@@ -9,4 +10,5 @@ __all__ = [
     "close_db",
     "sliver_manager",
     "get_sliver_client",
+    "audit_logger",
 ]
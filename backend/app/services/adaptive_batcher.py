@@ -0,0 +1,84 @@
+"""
+Adaptive batcher - coalesce concurrent ID-list operations into one call
+"""
+
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+# Handler contract shared with SliverManager.bulk_kill_*:
+# ids -> {"success": [id, ...], "failed": [{"id": id, "error": str}, ...]}
+BulkHandler = Callable[[List[str]], Awaitable[dict]]
+
+
+class AdaptiveBatcher:
+    """
+    Merges ID lists submitted concurrently into a single handler call
+
+    The first submit opens a window of max_wait seconds; everything submitted
+    before it closes (or before max_batch IDs are queued) is deduplicated and
+    sent to the handler at once. Each caller gets back only the results for
+    its own IDs.
+    """
+
+    def __init__(self, handler: BulkHandler, max_batch: int = 128, max_wait: float = 0.025):
+        self._handler = handler
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._pending: List[Tuple[List[str], asyncio.Future]] = []
+        self._pending_count = 0
+        self._full: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        # Keep references to windows still dispatching so they aren't collected
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, ids: List[str]) -> dict:
+        """Queue ids for the next batch and wait for their results"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((ids, future))
+        self._pending_count += len(ids)
+
+        if self._task is None:
+            self._full = asyncio.Event()
+            self._task = asyncio.create_task(self._run(self._full))
+            self._tasks.add(self._task)
+            self._task.add_done_callback(self._tasks.discard)
+        if self._pending_count >= self._max_batch:
+            self._full.set()
+
+        return await future
+
+    async def _run(self, full: asyncio.Event) -> None:
+        try:
+            await asyncio.wait_for(full.wait(), self._max_wait)
+        except asyncio.TimeoutError:
+            pass
+
+        # Later submits start a new window while this batch is dispatched
+        batch = self._pending
+        self._pending = []
+        self._pending_count = 0
+        self._full = None
+        self._task = None
+
+        await self._dispatch(batch)
+
+    async def _dispatch(self, batch: List[Tuple[List[str], asyncio.Future]]) -> None:
+        ids = list(dict.fromkeys(i for caller_ids, _ in batch for i in caller_ids))
+        try:
+            result = await self._handler(ids)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        succeeded = set(result["success"])
+        failed = {f["id"]: f for f in result["failed"]}
+        for caller_ids, future in batch:
+            if future.done():
+                continue
+            own = list(dict.fromkeys(caller_ids))
+            future.set_result({
+                "success": [i for i in own if i in succeeded],
+                "failed": [failed[i] for i in own if i in failed],
+            })
@@ -0,0 +1,21 @@
+"""
+Audit fast path - transactional audit rows without the ORM unit of work
+"""
+
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import AuditLog
+
+
+async def audit_insert(db: AsyncSession, **fields: Any) -> None:
+    """
+    Insert an audit log row as part of db's current transaction
+
+    Use this instead of audit_logger.log when the entry must commit or roll
+    back together with the change it records. The row is written with a Core
+    INSERT, so no AuditLog instance is built or tracked by the session.
+    """
+    await db.execute(insert(AuditLog).values(**fields))
@@ -0,0 +1,212 @@
+"""
+Batch writer service - buffered bulk inserts off the request path
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, List, Optional, Type
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError, StatementError
+
+from app.core.exceptions import WriteBacklogError
+from app.models import Base, AuditLog, CommandHistory
+from app.models.base import utc_now
+from app.services.database import async_session_maker
+
+logger = logging.getLogger(__name__)
+
+
+class BatchWriter:
+    """
+    Buffers rows for a model and bulk-inserts them from a background task
+
+    Rows are flushed as a single multi-row INSERT once max_batch rows are
+    queued or max_delay seconds have passed since the first queued row.
+
+    A failed INSERT is retried with backoff; if it keeps failing, or the
+    rows themselves are rejected, they are inserted one at a time so a bad
+    row only loses itself (and is logged in full). At most max_pending rows
+    wait in the queue; beyond that enqueue raises WriteBacklogError rather
+    than dropping rows silently.
+    """
+
+    # Seconds to wait before each retry of a failed batch INSERT
+    RETRY_DELAYS = (0.5, 1.0, 2.0, 4.0)
+
+    def __init__(
+        self,
+        model: Type[Base],
+        max_batch: int = 50,
+        max_delay: float = 0.2,
+        max_pending: int = 10_000,
+    ):
+        self._model = model
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self._max_pending = max_pending
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background flush task"""
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_pending)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush pending rows and stop the background task"""
+        if not self.is_running:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    def enqueue(self, row: dict) -> None:
+        """Queue a row for insertion; returns immediately"""
+        if not self.is_running:
+            self.start()
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            logger.error(
+                f"{self._model.__tablename__} write queue full, rejecting row: {row}"
+            )
+            raise WriteBacklogError(
+                f"Too many pending {self._model.__tablename__} writes, try again later"
+            )
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            row = await self._queue.get()
+            if row is None:
+                return
+
+            batch = [row]
+            stopping = False
+            deadline = loop.time() + self._max_delay
+            while len(batch) < self._max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, batch: List[dict]) -> None:
+        # executemany binds the first row's keys, so give every row the same keys
+        keys = {key for row in batch for key in row}
+        rows = [{key: row.get(key) for key in keys} for row in batch]
+
+        for delay in (*self.RETRY_DELAYS, None):
+            try:
+                await self._insert(rows)
+                return
+            except Exception as e:
+                if _is_bad_data(e) or delay is None:
+                    logger.error(
+                        f"Failed to write {len(rows)} {self._model.__tablename__} rows, "
+                        f"retrying one at a time: {e}"
+                    )
+                    break
+                logger.warning(
+                    f"Failed to write {len(rows)} {self._model.__tablename__} rows, "
+                    f"retrying in {delay}s: {e}"
+                )
+                await asyncio.sleep(delay)
+
+        for row in rows:
+            try:
+                await self._insert([row])
+            except Exception as e:
+                logger.error(f"Dropped {self._model.__tablename__} row {row}: {e}")
+
+    async def _insert(self, rows: List[dict]) -> None:
+        async with async_session_maker() as session:
+            await session.execute(insert(self._model), rows)
+            await session.commit()
+
+
+def _is_bad_data(error: Exception) -> bool:
+    """Whether a write failed because of the rows themselves, so retrying can't help"""
+    if isinstance(error, (IntegrityError, DataError)):
+        return True
+    # Raised while binding parameters, before reaching the database
+    return isinstance(error, StatementError) and not isinstance(error, DBAPIError)
+
+
+class AuditLogger(BatchWriter):
+    """Batched audit log writer"""
+
+    def __init__(self, max_batch: int = 50, max_delay: float = 0.2):
+        super().__init__(AuditLog, max_batch=max_batch, max_delay=max_delay)
+
+    def log(
+        self,
+        user_id: int,
+        action: str,
+        resource: str,
+        resource_id: Optional[str] = None,
+        details: Optional[Any] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ) -> None:
+        """Queue an audit log entry, timestamped now"""
+        self.enqueue({
+            "user_id": user_id,
+            "action": action,
+            "resource": resource,
+            "resource_id": resource_id,
+            "details": details,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "created_at": utc_now(),
+        })
+
+
+class CommandHistoryWriter(BatchWriter):
+    """Batched command history writer"""
+
+    def __init__(self, max_batch: int = 200, max_delay: float = 0.2):
+        super().__init__(CommandHistory, max_batch=max_batch, max_delay=max_delay)
+
+    def record(
+        self,
+        session_id: str,
+        session_type: str,
+        user_id: int,
+        command: str,
+        output: Optional[str] = None,
+        exit_code: Optional[int] = None,
+    ) -> None:
+        """Queue a command history entry, timestamped now"""
+        self.enqueue({
+            "session_id": session_id,
+            "session_type": session_type,
+            "user_id": user_id,
+            "command": command,
+            "output": output,
+            "exit_code": exit_code,
+            "executed_at": datetime.utcnow(),
+        })
+
+
+# Global writers, started/stopped in the app lifespan
+audit_logger = AuditLogger()
+history_writer = CommandHistoryWriter()
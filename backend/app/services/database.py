@@ -2,9 +2,11 @@
 Database service - SQLAlchemy async setup
 """
 
+import asyncio
 import logging
-from typing import AsyncGenerator
+from typing import AsyncGenerator, List, Sequence
 
+from sqlalchemy import Row, delete, func, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -19,12 +21,30 @@ database_url = settings.database_url
 if database_url.startswith("sqlite:///"):
     database_url = database_url.replace("sqlite:///", "sqlite+aiosqlite:///")
 
+# SQLite shares one connection (StaticPool) across all sessions
+is_sqlite = "sqlite" in database_url
+
 # Create async engine
+if is_sqlite:
+    engine_options = {
+        "connect_args": {"check_same_thread": False},
+        "poolclass": StaticPool,
+    }
+else:
+    # Pool is per worker process
+    engine_options = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        # Recycle before server/proxy idle timeouts drop connections
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": True,
+    }
+
 engine = create_async_engine(
     database_url,
     echo=settings.debug,
-    connect_args={"check_same_thread": False} if "sqlite" in database_url else {},
-    poolclass=StaticPool if "sqlite" in database_url else None,
+    **engine_options,
 )
 
 # Session factory
@@ -50,12 +70,55 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def fetch_all_concurrently(*statements) -> List[Sequence[Row]]:
+    """
+    Run independent SELECTs concurrently and return each one's rows
+
+    Every statement gets its own session (and pooled connection), since an
+    AsyncSession can't run queries concurrently. On SQLite all sessions share
+    one connection, so the statements run one after another instead.
+    """
+    async def fetch(statement) -> Sequence[Row]:
+        async with async_session_maker() as session:
+            return (await session.execute(statement)).all()
+
+    if is_sqlite:
+        return [await fetch(statement) for statement in statements]
+    return list(await asyncio.gather(*(fetch(statement) for statement in statements)))
+
+
+def _drop_duplicates(conn, table, index) -> None:
+    # Rows written before a unique index existed may repeat its key; keep the
+    # oldest row of each group so the index can be built
+    keep = select(func.min(table.c.id)).group_by(*index.columns)
+    result = conn.execute(delete(table).where(table.c.id.not_in(keep)))
+    if result.rowcount:
+        logger.warning(
+            f"Removed {result.rowcount} duplicate rows from {table.name} "
+            f"before creating {index.name}"
+        )
+
+
+def _create_missing_indexes(conn) -> None:
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            if index.unique:
+                _drop_duplicates(conn, table, index)
+            index.create(conn)
+
+
 async def init_db() -> None:
     """Initialize database - create tables and seed data"""
     try:
         async with engine.begin() as conn:
             # Create tables (if not exist)
             await conn.run_sync(Base.metadata.create_all)
+            # create_all skips existing tables, so add indexes introduced since
+            await conn.run_sync(_create_missing_indexes)
 
         # Seed initial data
         async with async_session_maker() as session:
@@ -0,0 +1,133 @@
+"""
+Implant builder - implant generation jobs run by the worker
+
+Kept free of import side effects: the API imports build_implant_task too,
+to run builds in-process when there is no Redis/arq.
+"""
+
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core.config import settings
+from app.services.batch_writer import audit_logger
+from app.services.implant_store import implant_store
+from app.services.sliver_client import sliver_manager
+
+logger = logging.getLogger(__name__)
+
+# Implant file extension by output format ("shared" depends on the OS)
+_EXT_MAP = {
+    "exe": ".exe",
+    "dll": ".dll",
+    "shellcode": ".bin",
+    "service": ".exe",
+}
+
+
+def _hexdigest(algorithm: str, data: bytes) -> str:
+    return hashlib.new(algorithm, data).hexdigest()
+
+
+def _ext_for(fmt: str, os_name: str) -> str:
+    if fmt == "shared":
+        return ".so" if os_name == "linux" else ".dylib"
+    return _EXT_MAP.get(fmt, "")
+
+
+async def build_implant_task(
+    ctx: dict,
+    config: dict,
+    user_id: int,
+    ip_address: Optional[str] = None,
+) -> None:
+    """
+    Generate an implant and store it for download
+
+    Progress is recorded in the implant store under the arq job id, which
+    GET /implants/jobs/{job_id} polls. Any failure, including arq cancelling
+    the job at job_timeout, marks the job as errored before propagating.
+    """
+    job_id = ctx["job_id"]
+    try:
+        await _build_implant(job_id, config, user_id, ip_address)
+    except BaseException as e:
+        if isinstance(e, asyncio.CancelledError):
+            error = "Implant generation timed out or was cancelled"
+        else:
+            error = str(e) or type(e).__name__
+        logger.error(f"Implant generation failed for job {job_id}: {error}")
+        try:
+            await implant_store.set_job(job_id, "error", error=error)
+        except Exception as store_error:
+            logger.error(f"Failed to record error for job {job_id}: {store_error}")
+        raise
+
+
+async def _build_implant(
+    job_id: str,
+    config: dict,
+    user_id: int,
+    ip_address: Optional[str],
+) -> None:
+    await implant_store.set_job(job_id, "running")
+
+    if not sliver_manager.is_connected:
+        await implant_store.set_job(job_id, "error", error="Sliver server not connected")
+        return
+
+    logger.info(f"Generating implant: {config['name']} ({config['os']}/{config['arch']})")
+
+    implant_data = await sliver_manager.generate_implant(config)
+
+    # Calculate hashes (MD5 only when enabled, it is a second full pass).
+    # hashlib releases the GIL on large buffers, so hash in threads to keep
+    # the event loop free and let both digests run side by side.
+    if settings.implant_md5:
+        sha256_hash, md5_hash = await asyncio.gather(
+            asyncio.to_thread(_hexdigest, "sha256", implant_data),
+            asyncio.to_thread(_hexdigest, "md5", implant_data),
+        )
+    else:
+        sha256_hash = await asyncio.to_thread(_hexdigest, "sha256", implant_data)
+        md5_hash = None
+
+    filename = f"{config['name']}{_ext_for(config['format'], config['os'])}"
+
+    # Cache implant for download
+    cache_key = f"{config['name']}_{sha256_hash[:8]}"
+    generated_at = datetime.now(timezone.utc)
+    await implant_store.save(cache_key, implant_data, filename, generated_at)
+
+    audit_logger.log(
+        user_id=user_id,
+        action="generate",
+        resource="implants",
+        resource_id=config["name"],
+        details={
+            "os": config["os"],
+            "arch": config["arch"],
+            "format": config["format"],
+            "size": len(implant_data),
+            "sha256": sha256_hash,
+            "md5": md5_hash,
+        },
+        ip_address=ip_address,
+    )
+
+    await implant_store.set_job(job_id, "done", implant={
+        "name": config["name"],
+        "filename": filename,
+        "os": config["os"],
+        "arch": config["arch"],
+        "format": config["format"],
+        "size": len(implant_data),
+        "md5": md5_hash,
+        "sha256": sha256_hash,
+        "generated_at": generated_at.isoformat(),
+        "download_url": f"/api/v1/implants/{cache_key}/download",
+    })
+
+    logger.info(f"Implant generated: {filename} ({len(implant_data)} bytes)")
@@ -0,0 +1,188 @@
+"""
+Implant store - generated implant binaries shared across workers
+"""
+
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, Union
+
+import orjson
+from cachetools import TTLCache
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.services.redis_client import redis_client
+
+
+class ImplantStore:
+    """
+    Redis-backed store for generated implants
+
+    The binary lives under implant:bin:{key} and its metadata (filename,
+    generated_at) in the hash implant:meta:{key}; both expire after ttl
+    seconds so stale artifacts are dropped automatically. Generation job
+    status is kept in the hash implant:job:{job_id} for the same period.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, redis: Redis, ttl: int):
+        self._redis = redis
+        self._ttl = ttl
+
+    @staticmethod
+    def _bin_key(key: str) -> str:
+        return f"implant:bin:{key}"
+
+    @staticmethod
+    def _meta_key(key: str) -> str:
+        return f"implant:meta:{key}"
+
+    async def save(self, key: str, data: bytes, filename: str, generated_at: datetime) -> None:
+        """Store an implant binary and its metadata"""
+        meta_key = self._meta_key(key)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.setex(self._bin_key(key), self._ttl, data)
+            pipe.hset(meta_key, mapping={
+                "filename": filename,
+                "generated_at": generated_at.isoformat(),
+            })
+            pipe.expire(meta_key, self._ttl)
+            await pipe.execute()
+
+    async def get_meta(self, key: str) -> Optional[dict]:
+        """Get implant metadata with its size in bytes, or None if missing/expired"""
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.strlen(self._bin_key(key))
+            pipe.hgetall(self._meta_key(key))
+            size, meta = await pipe.execute()
+        if not size or not meta:
+            return None
+        meta = {k.decode(): v.decode() for k, v in meta.items()}
+        meta["size"] = size
+        return meta
+
+    async def iter_chunks(self, key: str, size: int) -> AsyncIterator[bytes]:
+        """Yield an implant binary in CHUNK_SIZE slices read with GETRANGE"""
+        bin_key = self._bin_key(key)
+        for offset in range(0, size, self.CHUNK_SIZE):
+            chunk = await self._redis.getrange(bin_key, offset, offset + self.CHUNK_SIZE - 1)
+            if not chunk:
+                # Expired or deleted mid-download
+                return
+            yield chunk
+
+    async def delete(self, key: str) -> bool:
+        """Delete an implant; returns False if it did not exist"""
+        return await self._redis.delete(self._bin_key(key), self._meta_key(key)) > 0
+
+    async def set_job(
+        self,
+        job_id: str,
+        state: str,
+        error: Optional[str] = None,
+        implant: Optional[dict] = None,
+    ) -> None:
+        """Record the state of an implant generation job"""
+        mapping: Dict[str, Any] = {"state": state}
+        if error is not None:
+            mapping["error"] = error
+        if implant is not None:
+            mapping["implant"] = orjson.dumps(implant)
+        job_key = f"implant:job:{job_id}"
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(job_key, mapping=mapping)
+            pipe.expire(job_key, self._ttl)
+            await pipe.execute()
+
+    async def get_job(self, job_id: str) -> Optional[dict]:
+        """Get the state of an implant generation job, or None if unknown"""
+        job = await self._redis.hgetall(f"implant:job:{job_id}")
+        if not job:
+            return None
+        implant = job.get(b"implant")
+        error = job.get(b"error")
+        return {
+            "job_id": job_id,
+            "state": job[b"state"].decode(),
+            "error": error.decode() if error is not None else None,
+            "implant": orjson.loads(implant) if implant is not None else None,
+        }
+
+
+class MemoryImplantStore:
+    """
+    In-process implant store for single-worker deployments without Redis
+
+    Same interface as ImplantStore. Implants live in a TTLCache, so expired
+    and over-limit entries are evicted rather than pinned in memory.
+    """
+
+    CHUNK_SIZE = ImplantStore.CHUNK_SIZE
+
+    def __init__(self, maxsize: int, ttl: int):
+        self._implants: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._jobs: TTLCache = TTLCache(maxsize=1024, ttl=ttl)
+
+    async def save(self, key: str, data: bytes, filename: str, generated_at: datetime) -> None:
+        """Store an implant binary and its metadata"""
+        self._implants[key] = (data, {
+            "filename": filename,
+            "generated_at": generated_at.isoformat(),
+        })
+
+    async def get_meta(self, key: str) -> Optional[dict]:
+        """Get implant metadata with its size in bytes, or None if missing/expired"""
+        cached = self._implants.get(key)
+        if cached is None:
+            return None
+        data, meta = cached
+        return {**meta, "size": len(data)}
+
+    async def iter_chunks(self, key: str, size: int) -> AsyncIterator[bytes]:
+        """Yield an implant binary in CHUNK_SIZE slices"""
+        cached = self._implants.get(key)
+        if cached is None:
+            return
+        data = memoryview(cached[0])
+        for offset in range(0, size, self.CHUNK_SIZE):
+            yield bytes(data[offset:offset + self.CHUNK_SIZE])
+
+    async def delete(self, key: str) -> bool:
+        """Delete an implant; returns False if it did not exist"""
+        return self._implants.pop(key, None) is not None
+
+    async def set_job(
+        self,
+        job_id: str,
+        state: str,
+        error: Optional[str] = None,
+        implant: Optional[dict] = None,
+    ) -> None:
+        """Record the state of an implant generation job"""
+        job = self._jobs.get(job_id) or {"job_id": job_id, "error": None, "implant": None}
+        job["state"] = state
+        if error is not None:
+            job["error"] = error
+        if implant is not None:
+            job["implant"] = implant
+        self._jobs[job_id] = job
+
+    async def get_job(self, job_id: str) -> Optional[dict]:
+        """Get the state of an implant generation job, or None if unknown"""
+        job = self._jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+
+# Global implant store
+implant_store: Union[ImplantStore, MemoryImplantStore]
+if redis_client is not None:
+    implant_store = ImplantStore(redis_client, settings.implant_cache_ttl_seconds)
+else:
+    implant_store = MemoryImplantStore(
+        settings.implant_cache_max, settings.implant_cache_ttl_seconds
+    )
+
+
+async def get_implant_store() -> Union[ImplantStore, MemoryImplantStore]:
+    """Dependency to get the implant store"""
+    return implant_store
@@ -0,0 +1,121 @@
+"""
+Redis service - shared async client
+"""
+
+import functools
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+import orjson
+from arq.connections import ArqRedis
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Connections are opened lazily from the pool on first command. Without a
+# REDIS_URL both are None and callers fall back to in-process equivalents
+# (single-worker deployments only).
+redis_client: Optional[Redis] = None
+job_queue: Optional[ArqRedis] = None
+if settings.redis_url:
+    redis_client = Redis.from_url(settings.redis_url)
+    # arq job queue sharing the same connection pool (worker: app.worker, jobs: app.services.implant_builder)
+    job_queue = ArqRedis(connection_pool=redis_client.connection_pool)
+
+
+async def get_redis() -> Optional[Redis]:
+    """Dependency to get the shared Redis client"""
+    return redis_client
+
+
+async def get_job_queue() -> Optional[ArqRedis]:
+    """Dependency to get the background job queue, None without Redis"""
+    return job_queue
+
+
+def redis_memoize(key: str, ttl: int) -> Callable:
+    """
+    Cache the JSON-serializable result of an async call in Redis under key
+
+    The key is fixed, so only use this on calls whose result does not depend
+    on their arguments. If Redis is unavailable the call goes straight
+    through.
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if redis_client is None:
+                return await func(*args, **kwargs)
+            try:
+                cached = await redis_client.get(key)
+            except RedisError as e:
+                logger.debug(f"Redis lookup for {key} failed: {e}")
+                return await func(*args, **kwargs)
+            if cached is not None:
+                return orjson.loads(cached)
+
+            result = await func(*args, **kwargs)
+            try:
+                await redis_client.setex(key, ttl, orjson.dumps(result))
+            except RedisError as e:
+                logger.debug(f"Redis store for {key} failed: {e}")
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+async def redis_get_json(key: str) -> Any:
+    """Get a cached JSON value, or None if missing or Redis is unavailable"""
+    if redis_client is None:
+        return None
+    try:
+        cached = await redis_client.get(key)
+    except RedisError as e:
+        logger.debug(f"Redis lookup for {key} failed: {e}")
+        return None
+    return orjson.loads(cached) if cached is not None else None
+
+
+async def redis_set_json(key: str, value: Any, ttl: int) -> None:
+    """Cache a JSON-serializable value; Redis errors are ignored"""
+    if redis_client is None:
+        return
+    try:
+        await redis_client.setex(key, ttl, orjson.dumps(value))
+    except RedisError as e:
+        logger.debug(f"Redis store for {key} failed: {e}")
+
+
+async def redis_invalidate(*keys: str) -> None:
+    """Drop memoized keys; Redis errors are ignored"""
+    if redis_client is None:
+        return
+    try:
+        await redis_client.delete(*keys)
+    except RedisError as e:
+        logger.debug(f"Redis invalidation of {keys} failed: {e}")
+
+
+async def redis_invalidate_prefix(prefix: str) -> None:
+    """Drop every key starting with prefix (SCAN based, keep it off hot paths)"""
+    if redis_client is None:
+        return
+    try:
+        keys = [key async for key in redis_client.scan_iter(match=f"{prefix}*", count=500)]
+        if keys:
+            await redis_client.delete(*keys)
+    except RedisError as e:
+        logger.debug(f"Redis invalidation of {prefix}* failed: {e}")
+
+
+async def close_redis() -> None:
+    """Close Redis connections"""
+    if redis_client is None:
+        return
+    await redis_client.aclose()
+    logger.info("Redis connections closed")
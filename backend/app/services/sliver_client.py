@@ -3,24 +3,57 @@ Sliver Client Service - Wrapper around SliverPy
 """
 
 import asyncio
+import functools
 import logging
 import os
-from typing import Optional, List, Any
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple
 from pathlib import Path
 
-from app.core.config import settings
-from app.core.exceptions import SliverConnectionError, SliverCommandError
+from cachetools import TTLCache
+
+from app.core.config import settings, github_token_holder
+from app.core.exceptions import SliverConnectionError, SliverCommandError, NotFoundError
+from app.services.redis_client import redis_memoize, redis_invalidate
 
 logger = logging.getLogger(__name__)
 
 # Try to import sliver-py
 try:
     from sliver import SliverClient, SliverClientConfig
+    from sliver.pb.clientpb import client_pb2
     SLIVER_AVAILABLE = True
 except ImportError:
     SLIVER_AVAILABLE = False
     logger.warning("sliver-py not installed - Sliver features will be unavailable")
 
+# Redis keys for memoized listings, shared by all workers
+SESSIONS_CACHE_KEY = "sliver:sessions"
+BEACONS_CACHE_KEY = "sliver:beacons"
+JOBS_CACHE_KEY = "sliver:jobs"
+
+
+def _limit_rpc(func):
+    """Run a short leaf Sliver RPC under the manager's concurrency limit"""
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        async with self._rpc_sem:
+            return await func(self, *args, **kwargs)
+    return wrapper
+
+
+def _limit_long_rpc(func):
+    """
+    Run a long Sliver RPC (shells, transfers, builds) under its own limit
+
+    These can hold a slot for minutes, so they don't share the short-RPC
+    slots that listings and other endpoints need.
+    """
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        async with self._long_rpc_sem:
+            return await func(self, *args, **kwargs)
+    return wrapper
+
 
 class SliverManager:
     """
@@ -29,9 +62,20 @@ class SliverManager:
 
     def __init__(self):
         self._client: Optional[Any] = None
+        self._clients: List[Any] = []
+        self._next_client = 0
         self._config_path: Optional[str] = None
         self._connected: bool = False
         self._lock = asyncio.Lock()
+        # Short-lived session/beacon lookups so follow-up calls on the same
+        # implant don't each pay a full listing round-trip
+        self._session_cache: TTLCache = TTLCache(maxsize=1024, ttl=2.0)
+        self._beacon_cache: TTLCache = TTLCache(maxsize=1024, ttl=2.0)
+        # Caps in-flight RPCs to the Sliver server; only leaf calls take a
+        # slot so composite methods can't deadlock on it. Long calls have
+        # their own cap so they can't hold every short-call slot.
+        self._rpc_sem = asyncio.Semaphore(settings.sliver_max_concurrent_rpcs)
+        self._long_rpc_sem = asyncio.Semaphore(settings.sliver_max_concurrent_long_rpcs)
 
     @property
     def is_connected(self) -> bool:
@@ -45,6 +89,14 @@ class SliverManager:
             raise SliverConnectionError("Not connected to Sliver server")
         return self._client
 
+    def get_client(self) -> Any:
+        """Get the next pooled Sliver client (round-robin)"""
+        if not self._clients:
+            raise SliverConnectionError("Not connected to Sliver server")
+        client = self._clients[self._next_client % len(self._clients)]
+        self._next_client += 1
+        return client
+
     async def connect(self, config_path: Optional[str] = None) -> None:
         """Connect to Sliver server"""
         if not SLIVER_AVAILABLE:
@@ -66,9 +118,15 @@ class SliverManager:
                 # Parse config file
                 config = SliverClientConfig.parse_config_file(str(config_file))
 
-                # Create and connect client
-                self._client = SliverClient(config)
-                await self._client.connect()
+                # Create and connect the client pool; every client has its
+                # own gRPC channel, so concurrent calls spread across them
+                clients = [
+                    SliverClient(config)
+                    for _ in range(max(1, settings.sliver_client_pool_size))
+                ]
+                await asyncio.gather(*(client.connect() for client in clients))
+                self._clients = clients
+                self._client = clients[0]
 
                 self._config_path = config_path
                 self._connected = True
@@ -76,6 +134,7 @@ class SliverManager:
 
             except Exception as e:
                 self._client = None
+                self._clients = []
                 self._connected = False
                 raise SliverConnectionError(f"Failed to connect: {str(e)}")
 
@@ -86,6 +145,7 @@ class SliverManager:
                 try:
                     # SliverPy doesn't have explicit disconnect, but we clean up
                     self._client = None
+                    self._clients = []
                 except Exception as e:
                     logger.error(f"Error disconnecting: {e}")
                 finally:
@@ -102,11 +162,17 @@ class SliverManager:
 
     async def get_sessions(self) -> List[dict]:
         """Get all active sessions"""
+        # Checked outside the memoized fetch so the empty result while
+        # disconnected is never cached for the other workers
         if not self.is_connected:
             return []
+        return await self._fetch_sessions()
 
+    @redis_memoize(SESSIONS_CACHE_KEY, settings.sliver_cache_ttl_seconds)
+    @_limit_rpc
+    async def _fetch_sessions(self) -> List[dict]:
         try:
-            sessions = await self._client.sessions()
+            sessions = await self.get_client().sessions()
             return [self._session_to_dict(s) for s in sessions]
         except Exception as e:
             logger.error(f"Failed to get sessions: {e}")
@@ -114,28 +180,35 @@ class SliverManager:
 
     async def get_session(self, session_id: str) -> Optional[dict]:
         """Get specific session by ID"""
+        session = self._session_cache.get(session_id)
+        if session is not None:
+            return session
+
         sessions = await self.get_sessions()
-        for session in sessions:
-            if session["id"] == session_id:
-                return session
-        return None
+        for s in sessions:
+            self._session_cache[s["id"]] = s
+        return self._session_cache.get(session_id)
 
+    @_limit_rpc
     async def kill_session(self, session_id: str) -> bool:
         """Kill a session"""
         try:
-            session = await self._client.interact_session(session_id)
+            session = await self.get_client().interact_session(session_id)
             await session.kill()
+            self._session_cache.pop(session_id, None)
+            await redis_invalidate(SESSIONS_CACHE_KEY)
             return True
         except Exception as e:
             logger.error(f"Failed to kill session {session_id}: {e}")
             raise SliverCommandError(f"Failed to kill session: {str(e)}")
 
+    @_limit_long_rpc
     async def session_shell(
         self, session_id: str, command: str, timeout: int = 60
     ) -> dict:
         """Execute shell command on session"""
         try:
-            session = await self._client.interact_session(session_id)
+            session = await self.get_client().interact_session(session_id)
             result = await asyncio.wait_for(
                 session.execute(command, output=True),
                 timeout=timeout
@@ -151,10 +224,11 @@ class SliverManager:
             logger.error(f"Shell command failed: {e}")
             raise SliverCommandError(f"Command failed: {str(e)}")
 
+    @_limit_rpc
     async def session_ps(self, session_id: str) -> List[dict]:
         """Get process list from session"""
         try:
-            session = await self._client.interact_session(session_id)
+            session = await self.get_client().interact_session(session_id)
             result = await session.ps()
             return [
                 {
@@ -169,10 +243,11 @@ class SliverManager:
         except Exception as e:
             raise SliverCommandError(f"Failed to get process list: {str(e)}")
 
+    @_limit_rpc
     async def session_ls(self, session_id: str, path: str) -> dict:
         """List directory on session"""
         try:
-            session = await self._client.interact_session(session_id)
+            session = await self.get_client().interact_session(session_id)
             result = await session.ls(path)
             return {
                 "path": result.Path,
@@ -189,30 +264,33 @@ class SliverManager:
         except Exception as e:
             raise SliverCommandError(f"Failed to list directory: {str(e)}")
 
+    @_limit_long_rpc
     async def session_download(self, session_id: str, remote_path: str) -> bytes:
         """Download file from session"""
         try:
-            session = await self._client.interact_session(session_id)
+            session = await self.get_client().interact_session(session_id)
             result = await session.download(remote_path)
             return result.Data
         except Exception as e:
             raise SliverCommandError(f"Failed to download: {str(e)}")
 
+    @_limit_long_rpc
     async def session_upload(
         self, session_id: str, remote_path: str, data: bytes
     ) -> bool:
         """Upload file to session"""
         try:
-            session = await self._client.interact_session(session_id)
+            session = await self.get_client().interact_session(session_id)
             await session.upload(remote_path, data)
             return True
         except Exception as e:
             raise SliverCommandError(f"Failed to upload: {str(e)}")
 
+    @_limit_rpc
     async def session_screenshot(self, session_id: str) -> bytes:
         """Take screenshot from session"""
         try:
-            session = await self._client.interact_session(session_id)
+            session = await self.get_client().interact_session(session_id)
             result = await session.screenshot()
             return result.Data
         except Exception as e:
@@ -224,11 +302,17 @@ class SliverManager:
 
     async def get_beacons(self) -> List[dict]:
         """Get all beacons"""
+        # Checked outside the memoized fetch so the empty result while
+        # disconnected is never cached for the other workers
         if not self.is_connected:
             return []
+        return await self._fetch_beacons()
 
+    @redis_memoize(BEACONS_CACHE_KEY, settings.sliver_cache_ttl_seconds)
+    @_limit_rpc
+    async def _fetch_beacons(self) -> List[dict]:
         try:
-            beacons = await self._client.beacons()
+            beacons = await self.get_client().beacons()
             return [self._beacon_to_dict(b) for b in beacons]
         except Exception as e:
             logger.error(f"Failed to get beacons: {e}")
@@ -236,77 +320,107 @@ class SliverManager:
 
     async def get_beacon(self, beacon_id: str) -> Optional[dict]:
         """Get specific beacon"""
+        beacon = self._beacon_cache.get(beacon_id)
+        if beacon is not None:
+            return beacon
+
         beacons = await self.get_beacons()
-        for beacon in beacons:
-            if beacon["id"] == beacon_id:
-                return beacon
-        return None
+        for b in beacons:
+            self._beacon_cache[b["id"]] = b
+        return self._beacon_cache.get(beacon_id)
 
+    @_limit_rpc
     async def kill_beacon(self, beacon_id: str) -> bool:
         """Kill a beacon"""
         try:
-            await self._client.rm_beacon(beacon_id)
+            await self.get_client().rm_beacon(beacon_id)
+            self._beacon_cache.pop(beacon_id, None)
+            await redis_invalidate(BEACONS_CACHE_KEY)
             return True
         except Exception as e:
             raise SliverCommandError(f"Failed to kill beacon: {str(e)}")
 
+    async def _interact_beacon(self, beacon_id: str) -> Any:
+        """Get an interactive beacon, raising NotFoundError if it doesn't exist"""
+        beacon = await self.get_client().interact_beacon(beacon_id)
+        if beacon is None:
+            raise NotFoundError(f"Beacon {beacon_id} not found")
+        return beacon
+
+    @_limit_rpc
     async def get_beacon_tasks(self, beacon_id: str) -> List[dict]:
         """Get tasks for a beacon"""
         try:
-            tasks = await self._client.beacon_tasks(beacon_id)
+            tasks = await self.get_client().beacon_tasks(beacon_id)
             return [self._task_to_dict(t) for t in tasks]
         except Exception as e:
             raise SliverCommandError(f"Failed to get beacon tasks: {str(e)}")
 
+    @_limit_rpc
     async def beacon_shell(self, beacon_id: str, command: str) -> dict:
         """Queue shell command on beacon"""
         try:
-            beacon = await self._client.interact_beacon(beacon_id)
+            beacon = await self._interact_beacon(beacon_id)
             task = await beacon.execute(command, output=True)
             return {"task_id": task.TaskID, "beacon_id": beacon_id, "command": command}
+        except NotFoundError:
+            raise
         except Exception as e:
             raise SliverCommandError(f"Failed to queue shell task: {str(e)}")
 
+    @_limit_rpc
     async def beacon_download(self, beacon_id: str, remote_path: str) -> dict:
         """Queue download task on beacon"""
         try:
-            beacon = await self._client.interact_beacon(beacon_id)
+            beacon = await self._interact_beacon(beacon_id)
             task = await beacon.download(remote_path)
             return {"task_id": task.TaskID, "beacon_id": beacon_id, "path": remote_path}
+        except NotFoundError:
+            raise
         except Exception as e:
             raise SliverCommandError(f"Failed to queue download task: {str(e)}")
 
+    @_limit_rpc
     async def beacon_upload(self, beacon_id: str, remote_path: str, data: bytes) -> dict:
         """Queue upload task on beacon"""
         try:
-            beacon = await self._client.interact_beacon(beacon_id)
+            beacon = await self._interact_beacon(beacon_id)
             task = await beacon.upload(remote_path, data)
             return {"task_id": task.TaskID, "beacon_id": beacon_id, "path": remote_path}
+        except NotFoundError:
+            raise
         except Exception as e:
             raise SliverCommandError(f"Failed to queue upload task: {str(e)}")
 
+    @_limit_rpc
     async def beacon_ps(self, beacon_id: str) -> dict:
         """Queue process list task on beacon"""
         try:
-            beacon = await self._client.interact_beacon(beacon_id)
+            beacon = await self._interact_beacon(beacon_id)
             task = await beacon.ps()
             return {"task_id": task.TaskID, "beacon_id": beacon_id}
+        except NotFoundError:
+            raise
         except Exception as e:
             raise SliverCommandError(f"Failed to queue ps task: {str(e)}")
 
+    @_limit_rpc
     async def beacon_screenshot(self, beacon_id: str) -> dict:
         """Queue screenshot task on beacon"""
         try:
-            beacon = await self._client.interact_beacon(beacon_id)
+            beacon = await self._interact_beacon(beacon_id)
             task = await beacon.screenshot()
             return {"task_id": task.TaskID, "beacon_id": beacon_id}
+        except NotFoundError:
+            raise
         except Exception as e:
             raise SliverCommandError(f"Failed to queue screenshot task: {str(e)}")
 
+    @_limit_rpc
     async def get_task_result(self, beacon_id: str, task_id: str) -> Optional[dict]:
         """Get result of a beacon task"""
         try:
-            tasks = await self._client.beacon_tasks(beacon_id)
+            tasks = await self.get_client().beacon_tasks(beacon_id)
             for task in tasks:
                 if str(task.ID) == task_id:
                     return self._task_to_dict(task)
@@ -332,10 +446,11 @@ class SliverManager:
     # Pivoting Operations (SOCKS & Port Forwarding)
     # ═══════════════════════════════════════════════════════════════════════════
 
+    @_limit_rpc
     async def start_socks_proxy(self, session_id: str, host: str = "127.0.0.1", port: int = 1080) -> dict:
         """Start SOCKS5 proxy through session"""
         try:
-            session = await self._client.interact_session(session_id)
+            session = await self.get_client().interact_session(session_id)
             result = await session.socks5(host=host, port=port)
             return {
                 "id": str(result.TunnelID) if hasattr(result, 'TunnelID') else str(port),
@@ -347,15 +462,17 @@ class SliverManager:
         except Exception as e:
             raise SliverCommandError(f"Failed to start SOCKS proxy: {str(e)}")
 
+    @_limit_rpc
     async def stop_socks_proxy(self, session_id: str, tunnel_id: int) -> bool:
         """Stop SOCKS5 proxy"""
         try:
-            session = await self._client.interact_session(session_id)
+            session = await self.get_client().interact_session(session_id)
             await session.close_socks(tunnel_id)
             return True
         except Exception as e:
             raise SliverCommandError(f"Failed to stop SOCKS proxy: {str(e)}")
 
+    @_limit_rpc
     async def start_portfwd(
         self,
         session_id: str,
@@ -366,7 +483,7 @@ class SliverManager:
     ) -> dict:
         """Start port forwarding through session"""
         try:
-            session = await self._client.interact_session(session_id)
+            session = await self.get_client().interact_session(session_id)
             result = await session.portfwd(
                 remote_host=remote_host,
                 remote_port=remote_port,
@@ -385,19 +502,21 @@ class SliverManager:
         except Exception as e:
             raise SliverCommandError(f"Failed to start port forwarding: {str(e)}")
 
+    @_limit_rpc
     async def stop_portfwd(self, session_id: str, tunnel_id: int) -> bool:
         """Stop port forwarding"""
         try:
-            session = await self._client.interact_session(session_id)
+            session = await self.get_client().interact_session(session_id)
             await session.close_portfwd(tunnel_id)
             return True
         except Exception as e:
             raise SliverCommandError(f"Failed to stop port forwarding: {str(e)}")
 
+    @_limit_rpc
     async def list_pivots(self, session_id: str) -> List[dict]:
         """List all active pivots (socks + port forwards) for a session"""
         try:
-            session = await self._client.interact_session(session_id)
+            session = await self.get_client().interact_session(session_id)
             # Get SOCKS proxies
             socks_list = []
             try:
@@ -442,23 +561,32 @@ class SliverManager:
 
     async def get_jobs(self) -> List[dict]:
         """Get all active jobs (listeners)"""
+        # Checked outside the memoized fetch so the empty result while
+        # disconnected is never cached for the other workers
         if not self.is_connected:
             return []
+        return await self._fetch_jobs()
 
+    @redis_memoize(JOBS_CACHE_KEY, settings.sliver_cache_ttl_seconds)
+    @_limit_rpc
+    async def _fetch_jobs(self) -> List[dict]:
         try:
-            jobs = await self._client.jobs()
+            jobs = await self.get_client().jobs()
             return [self._job_to_dict(j) for j in jobs]
         except Exception as e:
             raise SliverCommandError(f"Failed to get jobs: {str(e)}")
 
+    @_limit_rpc
     async def start_mtls_listener(self, host: str, port: int) -> dict:
         """Start mTLS listener"""
         try:
-            job = await self._client.start_mtls_listener(host=host, port=port)
+            job = await self.get_client().start_mtls_listener(host=host, port=port)
+            await redis_invalidate(JOBS_CACHE_KEY)
             return self._job_to_dict(job)
         except Exception as e:
             raise SliverCommandError(f"Failed to start mTLS listener: {str(e)}")
 
+    @_limit_rpc
     async def start_https_listener(
         self, host: str, port: int, domain: str = "", website: str = "", **kwargs
     ) -> dict:
@@ -481,11 +609,13 @@ class SliverManager:
             # Filter out unsupported kwargs (like letsencrypt)
             # SliverPy may not support all sliver CLI options
 
-            job = await self._client.start_https_listener(**listener_kwargs)
+            job = await self.get_client().start_https_listener(**listener_kwargs)
+            await redis_invalidate(JOBS_CACHE_KEY)
             return self._job_to_dict(job)
         except Exception as e:
             raise SliverCommandError(f"Failed to start HTTPS listener: {str(e)}")
 
+    @_limit_rpc
     async def start_http_listener(
         self, host: str, port: int, domain: str = "", website: str = "", **kwargs
     ) -> dict:
@@ -504,27 +634,32 @@ class SliverManager:
             if website:
                 listener_kwargs["website"] = website
 
-            job = await self._client.start_http_listener(**listener_kwargs)
+            job = await self.get_client().start_http_listener(**listener_kwargs)
+            await redis_invalidate(JOBS_CACHE_KEY)
             return self._job_to_dict(job)
         except Exception as e:
             raise SliverCommandError(f"Failed to start HTTP listener: {str(e)}")
 
+    @_limit_rpc
     async def start_dns_listener(
         self, domains: List[str], host: str, port: int, **kwargs
     ) -> dict:
         """Start DNS listener"""
         try:
-            job = await self._client.start_dns_listener(
+            job = await self.get_client().start_dns_listener(
                 domains=domains, host=host, port=port, **kwargs
             )
+            await redis_invalidate(JOBS_CACHE_KEY)
             return self._job_to_dict(job)
         except Exception as e:
             raise SliverCommandError(f"Failed to start DNS listener: {str(e)}")
 
+    @_limit_rpc
     async def kill_job(self, job_id: int) -> bool:
         """Kill a job/listener"""
         try:
-            await self._client.kill_job(job_id)
+            await self.get_client().kill_job(job_id)
+            await redis_invalidate(JOBS_CACHE_KEY)
             return True
         except Exception as e:
             raise SliverCommandError(f"Failed to kill job: {str(e)}")
@@ -533,14 +668,15 @@ class SliverManager:
     # Implant Generation
     # ═══════════════════════════════════════════════════════════════════════════
 
+    @_limit_long_rpc
     async def generate_implant(self, config: dict) -> bytes:
         """Generate an implant with the given configuration"""
         try:
             # Build implant config based on type
             if config.get("beacon", False):
-                implant = await self._client.generate_beacon(**self._build_implant_config(config))
+                implant = await self.get_client().generate_beacon(**self._build_implant_config(config))
             else:
-                implant = await self._client.generate(**self._build_implant_config(config))
+                implant = await self.get_client().generate(**self._build_implant_config(config))
 
             return implant.File.Data
         except Exception as e:
@@ -566,6 +702,33 @@ class SliverManager:
             "jitter": config.get("jitter", 30),
         }
 
+    # ═══════════════════════════════════════════════════════════════════════════
+    # Events
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    async def event_stream(self) -> AsyncIterator[Tuple[str, dict]]:
+        """
+        Yield session/beacon changes from Sliver's event stream
+
+        Yields (event, data) pairs: ("session.new", session),
+        ("session.lost", {"id": ...}) and ("beacon.new", beacon). Cached
+        listings are invalidated as changes arrive. Not RPC-limited: the
+        stream stays open for as long as the connection does.
+        """
+        async for event in self.get_client().events():
+            if event.EventType == "session-connected":
+                await redis_invalidate(SESSIONS_CACHE_KEY)
+                yield "session.new", self._session_to_dict(event.Session)
+            elif event.EventType == "session-disconnected":
+                self._session_cache.pop(event.Session.ID, None)
+                await redis_invalidate(SESSIONS_CACHE_KEY)
+                yield "session.lost", {"id": event.Session.ID}
+            elif event.EventType == "beacon-registered":
+                beacon = client_pb2.Beacon()
+                beacon.ParseFromString(event.Data)
+                await redis_invalidate(BEACONS_CACHE_KEY)
+                yield "beacon.new", self._beacon_to_dict(beacon)
+
     # ═══════════════════════════════════════════════════════════════════════════
     # Helper Methods
     # ═══════════════════════════════════════════════════════════════════════════
@@ -728,8 +891,10 @@ class SliverManager:
 
         # Build environment with GitHub token if available
         env = {**os.environ, "HOME": str(Path.home())}
-        if settings.github_token:
-            env["GITHUB_TOKEN"] = settings.github_token
+        env.pop("GITHUB_TOKEN", None)
+        github_token = github_token_holder.get()
+        if github_token:
+            env["GITHUB_TOKEN"] = github_token
             logger.debug("Using GitHub token for armory operations")
 
         try:
@@ -1069,12 +1234,13 @@ class SliverManager:
     # Execute-Assembly Operations
     # ═══════════════════════════════════════════════════════════════════════════
 
+    @_limit_long_rpc
     async def session_execute_assembly(
         self, session_id: str, assembly_path: str, arguments: str = "", timeout: int = 300
     ) -> dict:
         """Execute .NET assembly on session"""
         try:
-            session = await self._client.interact_session(session_id)
+            session = await self.get_client().interact_session(session_id)
             # Read assembly from local path
             with open(assembly_path, 'rb') as f:
                 assembly_data = f.read()
@@ -1094,12 +1260,13 @@ class SliverManager:
         except Exception as e:
             raise SliverCommandError(f"Execute-assembly failed: {str(e)}")
 
+    @_limit_rpc
     async def beacon_execute_assembly(
         self, beacon_id: str, assembly_path: str, arguments: str = ""
     ) -> dict:
         """Queue execute-assembly task on beacon"""
         try:
-            beacon = await self._client.interact_beacon(beacon_id)
+            beacon = await self._interact_beacon(beacon_id)
             # Read assembly from local path
             with open(assembly_path, 'rb') as f:
                 assembly_data = f.read()
@@ -1111,6 +1278,8 @@ class SliverManager:
                 "assembly": assembly_path,
                 "arguments": arguments,
             }
+        except NotFoundError:
+            raise
         except FileNotFoundError:
             raise SliverCommandError(f"Assembly file not found: {assembly_path}")
         except Exception as e:
@@ -1175,31 +1344,26 @@ class SliverManager:
 
         return dead
 
-    async def bulk_kill_sessions(self, session_ids: List[str]) -> dict:
-        """Kill multiple sessions at once"""
-        results = {"success": [], "failed": []}
-
-        for session_id in session_ids:
-            try:
-                await self.kill_session(session_id)
-                results["success"].append(session_id)
-            except Exception as e:
-                results["failed"].append({"id": session_id, "error": str(e)})
+    async def _bulk_kill(self, ids: List[Any], kill: Callable[[Any], Awaitable[Any]]) -> dict:
+        """Run kill for every id concurrently; the RPC limit caps how many are in flight"""
+        ids = list(dict.fromkeys(ids))
+        outcomes = await asyncio.gather(*(kill(i) for i in ids), return_exceptions=True)
 
+        results = {"success": [], "failed": []}
+        for i, outcome in zip(ids, outcomes):
+            if isinstance(outcome, BaseException):
+                results["failed"].append({"id": i, "error": str(outcome)})
+            else:
+                results["success"].append(i)
         return results
 
+    async def bulk_kill_sessions(self, session_ids: List[str]) -> dict:
+        """Kill multiple sessions at once"""
+        return await self._bulk_kill(session_ids, self.kill_session)
+
     async def bulk_kill_beacons(self, beacon_ids: List[str]) -> dict:
         """Kill multiple beacons at once"""
-        results = {"success": [], "failed": []}
-
-        for beacon_id in beacon_ids:
-            try:
-                await self.kill_beacon(beacon_id)
-                results["success"].append(beacon_id)
-            except Exception as e:
-                results["failed"].append({"id": beacon_id, "error": str(e)})
-
-        return results
+        return await self._bulk_kill(beacon_ids, self.kill_beacon)
 
     async def kill_all_sessions(self) -> dict:
         """Kill all sessions"""
@@ -1216,16 +1380,9 @@ class SliverManager:
     async def kill_all_jobs(self) -> dict:
         """Kill all jobs/listeners"""
         jobs = await self.get_jobs()
-        results = {"success": [], "failed": []}
-
-        for job in jobs:
-            try:
-                await self.kill_job(int(job["id"]))
-                results["success"].append(job["id"])
-            except Exception as e:
-                results["failed"].append({"id": job["id"], "error": str(e)})
-
-        return results
+        return await self._bulk_kill(
+            [job["id"] for job in jobs], lambda job_id: self.kill_job(int(job_id))
+        )
 
 
 # Global Sliver manager instance
@@ -0,0 +1,66 @@
+"""
+Background worker - long-running jobs off the request path
+
+Run with: arq app.worker.WorkerSettings
+"""
+
+import asyncio
+import logging
+
+from arq.connections import RedisSettings
+
+from app.core.config import settings
+from app.services.batch_writer import audit_logger
+from app.services.database import close_db
+from app.services.implant_builder import build_implant_task
+from app.services.redis_client import close_redis
+from app.services.sliver_client import sliver_manager
+
+logger = logging.getLogger(__name__)
+
+# arq creates its event loop after importing this module, so the policy set
+# here applies to it. Only the arq worker imports this module; the API gets
+# build_implant_task from app.services.implant_builder and its loop is left
+# to uvicorn (--loop auto already prefers uvloop).
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    # uvloop does not support Windows
+    pass
+
+
+async def startup(ctx: dict) -> None:
+    """Connect to Sliver and start the audit log writer"""
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level.upper()),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    audit_logger.start()
+    if settings.sliver_config:
+        try:
+            await sliver_manager.connect()
+            logger.info("Connected to Sliver server")
+        except Exception as e:
+            logger.warning(f"Failed to connect to Sliver: {e}")
+
+
+async def shutdown(ctx: dict) -> None:
+    """Disconnect from Sliver and flush pending writes"""
+    await sliver_manager.disconnect()
+    await audit_logger.stop()
+    await close_redis()
+    await close_db()
+
+
+class WorkerSettings:
+    """arq worker configuration"""
+
+    functions = [build_implant_task]
+    on_startup = startup
+    on_shutdown = shutdown
+    # The worker is only used when REDIS_URL is set
+    redis_settings = RedisSettings.from_dsn(settings.redis_url) if settings.redis_url else RedisSettings()
+    # Implant builds can take several minutes
+    job_timeout = 600
+    max_jobs = 4
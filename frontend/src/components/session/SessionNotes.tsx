@@ -1,5 +1,5 @@
 import { useState } from 'react'
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import { useInfiniteQuery, useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import { notesApi } from '@/services/api'
 import { useToast } from '@/components/ui/use-toast'
 import { Button } from '@/components/ui/button'
@@ -60,6 +60,8 @@ interface TagItem {
   created_at: string
 }
 
+const NOTES_PAGE_SIZE = 50
+
 export function SessionNotes({ sessionId, sessionType }: SessionNotesProps) {
   const [newNote, setNewNote] = useState('')
   const [editingNote, setEditingNote] = useState<Note | null>(null)
@@ -70,11 +72,25 @@ export function SessionNotes({ sessionId, sessionType }: SessionNotesProps) {
   const { toast } = useToast()
   const queryClient = useQueryClient()
 
-  // Query notes
-  const { data: notes = [], isLoading: notesLoading } = useQuery({
+  // Query notes, newest first, one page at a time
+  const {
+    data: notePages,
+    isLoading: notesLoading,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useInfiniteQuery({
     queryKey: ['session-notes', sessionId, sessionType],
-    queryFn: () => notesApi.getSessionNotes(sessionId, sessionType),
+    queryFn: ({ pageParam }) =>
+      notesApi.getSessionNotes(sessionId, sessionType, pageParam, NOTES_PAGE_SIZE),
+    initialPageParam: undefined as { before: string; beforeId: number } | undefined,
+    getNextPageParam: (lastPage: Note[]) => {
+      if (lastPage.length < NOTES_PAGE_SIZE) return undefined
+      const last = lastPage[lastPage.length - 1]
+      return { before: last.created_at, beforeId: last.id }
+    },
   })
+  const notes: Note[] = notePages?.pages.flat() ?? []
 
   // Query all tags
   const { data: allTags = [] } = useQuery({
@@ -346,7 +362,7 @@ export function SessionNotes({ sessionId, sessionType }: SessionNotesProps) {
           <div className="flex items-center justify-between">
             <CardTitle className="text-sm font-medium flex items-center gap-2">
               <StickyNote className="h-4 w-4" />
-              Notes ({notes.length})
+              Notes ({notes.length}{hasNextPage ? '+' : ''})
             </CardTitle>
             <Button
               variant="outline"
@@ -457,6 +473,18 @@ export function SessionNotes({ sessionId, sessionType }: SessionNotesProps) {
                   )}
                 </div>
               ))}
+              {hasNextPage && (
+                <div className="flex justify-center">
+                  <Button
+                    variant="outline"
+                    size="sm"
+                    onClick={() => fetchNextPage()}
+                    disabled={isFetchingNextPage}
+                  >
+                    {isFetchingNextPage ? 'Loading...' : 'Load more'}
+                  </Button>
+                </div>
+              )}
             </div>
           )}
         </CardContent>
@@ -4,7 +4,7 @@ import { useToast } from '@/components/ui/use-toast'
 import { useNotificationStore } from '@/store/notificationStore'
 
 interface WebSocketMessage {
-  event: 'connected' | 'session.new' | 'session.lost' | 'beacon.new' | 'beacon.checkin' | 'task_completed' | 'notification' | 'ping' | 'pong' | 'subscribed' | 'error'
+  event: 'connected' | 'delta' | 'session.new' | 'session.lost' | 'beacon.new' | 'beacon.checkin' | 'task_completed' | 'notification' | 'ping' | 'pong' | 'subscribed' | 'error'
   data?: any
 }
 
@@ -50,6 +50,46 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
   const handleMessage = useCallback((event: MessageEvent) => {
     const addNotification = useNotificationStore.getState().addNotification
 
+    const notifySessionNew = (data: any) => {
+      toast({
+        title: 'New Session Connected',
+        description: `${data?.name || data?.id} connected from ${data?.remote_address || 'unknown'}`,
+      })
+      addNotification({
+        type: 'session',
+        title: 'New Session',
+        message: `${data?.name || data?.id} connected from ${data?.remote_address || 'unknown'}`,
+        data,
+      })
+    }
+
+    const notifySessionLost = (data: any) => {
+      toast({
+        variant: 'destructive',
+        title: 'Session Disconnected',
+        description: `Session ${data?.id} has disconnected`,
+      })
+      addNotification({
+        type: 'warning',
+        title: 'Session Disconnected',
+        message: `Session ${data?.id} has disconnected`,
+        data,
+      })
+    }
+
+    const notifyBeaconNew = (data: any) => {
+      toast({
+        title: 'New Beacon',
+        description: `${data?.name || data?.id} first check-in`,
+      })
+      addNotification({
+        type: 'beacon',
+        title: 'New Beacon',
+        message: `${data?.name || data?.id} first check-in from ${data?.remote_address || 'unknown'}`,
+        data,
+      })
+    }
+
     try {
       const message: WebSocketMessage = JSON.parse(event.data)
       setLastMessage(message)
@@ -59,50 +99,38 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
           console.log('WebSocket connected, sliver status:', message.data?.sliver_connected)
           break
 
+        case 'delta': {
+          // All session/beacon changes from one server poll in a single frame
+          const { sessions_new = [], sessions_lost = [], beacons_new = [] } = message.data || {}
+          if (sessions_new.length || sessions_lost.length) {
+            queryClient.invalidateQueries({ queryKey: ['sessions'] })
+          }
+          if (beacons_new.length) {
+            queryClient.invalidateQueries({ queryKey: ['beacons'] })
+          }
+          queryClient.invalidateQueries({ queryKey: ['dashboard-stats'] })
+          sessions_new.forEach(notifySessionNew)
+          sessions_lost.forEach(notifySessionLost)
+          beacons_new.forEach(notifyBeaconNew)
+          break
+        }
+
         case 'session.new':
           queryClient.invalidateQueries({ queryKey: ['sessions'] })
           queryClient.invalidateQueries({ queryKey: ['dashboard-stats'] })
-          toast({
-            title: 'New Session Connected',
-            description: `${message.data?.name || message.data?.id} connected from ${message.data?.remote_address || 'unknown'}`,
-          })
-          addNotification({
-            type: 'session',
-            title: 'New Session',
-            message: `${message.data?.name || message.data?.id} connected from ${message.data?.remote_address || 'unknown'}`,
-            data: message.data,
-          })
+          notifySessionNew(message.data)
           break
 
         case 'session.lost':
           queryClient.invalidateQueries({ queryKey: ['sessions'] })
           queryClient.invalidateQueries({ queryKey: ['dashboard-stats'] })
-          toast({
-            variant: 'destructive',
-            title: 'Session Disconnected',
-            description: `Session ${message.data?.id} has disconnected`,
-          })
-          addNotification({
-            type: 'warning',
-            title: 'Session Disconnected',
-            message: `Session ${message.data?.id} has disconnected`,
-            data: message.data,
-          })
+          notifySessionLost(message.data)
           break
 
         case 'beacon.new':
           queryClient.invalidateQueries({ queryKey: ['beacons'] })
           queryClient.invalidateQueries({ queryKey: ['dashboard-stats'] })
-          toast({
-            title: 'New Beacon',
-            description: `${message.data?.name || message.data?.id} first check-in`,
-          })
-          addNotification({
-            type: 'beacon',
-            title: 'New Beacon',
-            message: `${message.data?.name || message.data?.id} first check-in from ${message.data?.remote_address || 'unknown'}`,
-            data: message.data,
-          })
+          notifyBeaconNew(message.data)
           break
 
         case 'beacon.checkin':
@@ -71,7 +71,7 @@ export function Implants() {
       toast({
         variant: 'destructive',
         title: 'Failed to generate implant',
-        description: error.response?.data?.detail,
+        description: error.response?.data?.detail || error.message,
       })
     },
   })
@@ -496,13 +496,15 @@ export function Implants() {
                         <p className="font-medium">{generatedImplant.format}</p>
                       </div>
                     </div>
-                    <div className="mt-4">
-                      <span className="text-muted-foreground text-sm">MD5:</span>
-                      <p className="font-mono text-xs break-all">
-                        {generatedImplant.md5}
-                      </p>
-                    </div>
-                    <div className="mt-2">
+                    {generatedImplant.md5 && (
+                      <div className="mt-4">
+                        <span className="text-muted-foreground text-sm">MD5:</span>
+                        <p className="font-mono text-xs break-all">
+                          {generatedImplant.md5}
+                        </p>
+                      </div>
+                    )}
+                    <div className={generatedImplant.md5 ? 'mt-2' : 'mt-4'}>
                       <span className="text-muted-foreground text-sm">SHA256:</span>
                       <p className="font-mono text-xs break-all">
                         {generatedImplant.sha256}
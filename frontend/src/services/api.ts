@@ -148,6 +148,14 @@ export const sessionsApi = {
     return response.data
   },
 
+  batchFileOperations: async (
+    id: string,
+    operations: Array<{ op: 'kill' | 'mkdir' | 'delete'; path?: string; pid?: number }>
+  ) => {
+    const response = await api.post(`/sessions/${id}/files/batch`, { operations })
+    return response.data
+  },
+
   download: async (id: string, path: string) => {
     const response = await api.get(`/sessions/${id}/files/download?path=${encodeURIComponent(path)}`, {
       responseType: 'blob',
@@ -300,8 +308,19 @@ export const implantsApi = {
     debug?: boolean
     evasion?: boolean
   }) => {
+    // Generation runs as a background job; poll until the implant is ready
     const response = await api.post('/implants/generate', config)
-    return response.data
+    const { job_id } = response.data
+    // Give up after the worker's job_timeout (10 minutes), e.g. when no
+    // worker is picking up queued jobs
+    const deadline = Date.now() + 10 * 60 * 1000
+    while (Date.now() < deadline) {
+      await new Promise((resolve) => setTimeout(resolve, 2000))
+      const { data: job } = await api.get(`/implants/jobs/${job_id}`)
+      if (job.state === 'done') return job.implant
+      if (job.state === 'error') throw new Error(job.error || 'Implant generation failed')
+    }
+    throw new Error('Implant generation timed out')
   },
 
   download: async (key: string) => {
@@ -320,9 +339,19 @@ export const implantsApi = {
 // Notes & Tags
 export const notesApi = {
   // Notes
-  getSessionNotes: async (sessionId: string, sessionType: string = 'session') => {
+  getSessionNotes: async (
+    sessionId: string,
+    sessionType: string = 'session',
+    cursor?: { before: string; beforeId: number },
+    limit?: number
+  ) => {
     const response = await api.get(`/notes/sessions/${sessionId}/notes`, {
-      params: { session_type: sessionType },
+      params: {
+        session_type: sessionType,
+        before: cursor?.before,
+        before_id: cursor?.beforeId,
+        limit,
+      },
     })
     return response.data
   },
@@ -363,10 +392,16 @@ export const notesApi = {
   },
 
   getSessionTags: async (sessionId: string, sessionType: string = 'session') => {
-    const response = await api.get(`/notes/sessions/${sessionId}/tags`, {
-      params: { session_type: sessionType },
-    })
-    return response.data
+    // Tag toggling needs the full set, so walk every page (usually just one)
+    const limit = 200
+    const tags: any[] = []
+    for (;;) {
+      const response = await api.get(`/notes/sessions/${sessionId}/tags`, {
+        params: { session_type: sessionType, after: tags[tags.length - 1]?.name, limit },
+      })
+      tags.push(...response.data)
+      if (response.data.length < limit) return tags
+    }
   },
 
   addTagToSession: async (sessionId: string, tagId: number, sessionType: string = 'session') => {
@@ -400,8 +435,11 @@ export const notesApi = {
     exitCode?: number,
     sessionType: string = 'session'
   ) => {
-    const response = await api.post(`/notes/sessions/${sessionId}/history`, null, {
-      params: { command, output, exit_code: exitCode, session_type: sessionType },
+    const response = await api.post(`/notes/sessions/${sessionId}/history`, {
+      command,
+      output,
+      exit_code: exitCode,
+      session_type: sessionType,
     })
     return response.data
   },